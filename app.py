@@ -1,7 +1,8 @@
 import streamlit as st
 import requests
 from core.auth import init_auth, login_success, is_authenticated
-from core.config import API_BASE_URL, LOGIN_ENDPOINT
+from core.client import request
+from core.config import LOGIN_ENDPOINT
 from core.validators import valid_email
 
 if is_authenticated():
@@ -14,8 +15,9 @@ else:
         payload = {"grant_type": "password", "username": email, "password": password}
 
         try:
-            response = requests.post(
-                f"{API_BASE_URL}{LOGIN_ENDPOINT}",
+            response = request(
+                "POST",
+                LOGIN_ENDPOINT,
                 data=payload,
                 headers={"Content-Type": "application/x-www-form-urlencoded"},
             )
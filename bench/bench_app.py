@@ -0,0 +1,232 @@
+# bench/bench_app.py
+#
+# Headless end-to-end benchmarks: drives app.py and the pages through
+# Streamlit's AppTest against bench.stub_backend and reports, per scenario,
+# rerun wall time, backend calls and response bytes.
+#
+#   python -m bench.bench_app [--posts 5000] [--users 5] [--latency-ms 0]
+#                             [--save] [--baseline bench/baseline.json]
+#
+# --save writes the results to the baseline file; without it, an existing
+# baseline is shown next to the new numbers. Baselines are machine-specific,
+# so keep them out of git.
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+from bench.stub_backend import PASSWORD, StubBackend, token_for
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = ROOT / "bench" / "baseline.json"
+TIMEOUT = 120
+
+
+def _app_test(script, user_id=None):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT / script), default_timeout=TIMEOUT)
+    if user_id is not None:
+        at.session_state["authenticated"] = True
+        at.session_state["access_token"] = token_for(user_id)
+    return at
+
+
+def _reset_process_caches():
+    # Every scenario starts cold, as a freshly started server would
+    from core.feed_cache import feed_cache
+    from core.response_cache import response_cache
+
+    feed_cache.invalidate()
+    response_cache.clear()
+
+
+def _check(at):
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return at
+
+
+# -------------------- scenarios --------------------
+# Each returns (setup, actions): setup() builds an AppTest in the state the
+# scenario starts from (not measured), actions(at) yields one callable per
+# measured interaction.
+def login():
+    def setup():
+        at = _check(_app_test("app.py").run())
+        at.text_input[0].input("user1@example.com")
+        at.text_input[1].input(PASSWORD)
+        return at
+
+    def actions(at):
+        yield lambda: _check(at.button[0].click().run())
+
+    return setup, actions
+
+
+def cold_feed():
+    return (
+        lambda: _app_test("pages/1_All_Posts.py", user_id=1),
+        lambda at: iter([lambda: _check(at.run())]),
+    )
+
+
+def _warm_feed():
+    return _check(_app_test("pages/1_All_Posts.py", user_id=1).run())
+
+
+def load_more_x10():
+    def actions(at):
+        for _ in range(10):
+            yield lambda: _check(at.button(key="load_more_footer").click().run())
+
+    return _warm_feed, actions
+
+
+def vote():
+    def actions(at):
+        button = next(b for b in at.button if b.label.startswith(("👍", "👎")))
+        yield lambda: _check(button.click().run())
+
+    return _warm_feed, actions
+
+
+def search_change():
+    def actions(at):
+        yield lambda: _check(at.text_input(key="feed_search").input("cache").run())
+
+    return _warm_feed, actions
+
+
+def my_posts_cold():
+    return (
+        lambda: _app_test("pages/2_My_Posts.py", user_id=1),
+        lambda at: iter([lambda: _check(at.run())]),
+    )
+
+
+def my_posts_all():
+    # Pages through every post of user 1 (1000 with the default dataset)
+    def setup():
+        return _check(_app_test("pages/2_My_Posts.py", user_id=1).run())
+
+    def actions(at):
+        while True:
+            more = [b for b in at.button if b.label == "Load More"]
+            if not more:
+                return
+            yield lambda: _check(more[0].click().run())
+
+    return setup, actions
+
+
+SCENARIOS = {
+    "login": login,
+    "cold_feed": cold_feed,
+    "load_more_x10": load_more_x10,
+    "vote": vote,
+    "search_change": search_change,
+    "my_posts_cold": my_posts_cold,
+    "my_posts_all": my_posts_all,
+}
+
+
+def run_scenario(backend, scenario):
+    setup, actions = scenario()
+    _reset_process_caches()
+    at = setup()
+    backend.reset_counters()
+    steps = 0
+    wall = 0.0
+    for action in actions(at):
+        start = time.perf_counter()
+        action()
+        wall += time.perf_counter() - start
+        steps += 1
+    return {
+        "steps": steps,
+        "wall_ms": round(wall * 1000, 1),
+        "ms_per_step": round(wall * 1000 / max(steps, 1), 1),
+        "backend_calls": len(backend.calls),
+        "response_bytes": backend.bytes_sent,
+    }
+
+
+def _delta(new, old):
+    if not old:
+        return ""
+    return f"{100 * (new - old) / old:+.0f}%"
+
+
+def report(results, baseline):
+    header = f"{'scenario':<16}{'steps':>6}{'wall ms':>10}{'ms/step':>9}"
+    header += f"{'calls':>7}{'bytes':>10}"
+    if baseline:
+        header += f"{'Δ wall':>9}{'Δ calls':>9}{'Δ bytes':>9}"
+    print(header)
+    for name, r in results.items():
+        line = f"{name:<16}{r['steps']:>6}{r['wall_ms']:>10}{r['ms_per_step']:>9}"
+        line += f"{r['backend_calls']:>7}{r['response_bytes']:>10}"
+        old = baseline.get(name) if baseline else None
+        if old:
+            line += f"{_delta(r['wall_ms'], old['wall_ms']):>9}"
+            line += f"{_delta(r['backend_calls'], old['backend_calls']):>9}"
+            line += f"{_delta(r['response_bytes'], old['response_bytes']):>9}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true")
+    parser.add_argument("scenarios", nargs="*", help=", ".join(SCENARIOS))
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    backend = StubBackend(
+        posts=args.posts, users=args.users, latency=args.latency_ms / 1000
+    ).start()
+    # Must be set before anything imports core.config
+    os.environ["API_BASE_URL"] = backend.url
+    os.chdir(ROOT)
+
+    names = args.scenarios or list(SCENARIOS)
+    try:
+        results = {name: run_scenario(backend, SCENARIOS[name]) for name in names}
+    finally:
+        backend.stop()
+
+    baseline = None
+    if args.baseline.exists() and not args.save:
+        baseline = json.loads(args.baseline.read_text())["results"]
+    print(
+        f"{args.posts} posts, {args.users} users, "
+        f"{args.latency_ms:g} ms backend latency"
+    )
+    report(results, baseline)
+
+    if args.save:
+        args.baseline.write_text(
+            json.dumps(
+                {
+                    "posts": args.posts,
+                    "users": args.users,
+                    "latency_ms": args.latency_ms,
+                    "results": results,
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"saved {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# bench/bench_css_payload.py
+#
+# CSS bytes each full rerun sends to the browser, per page: the old layout
+# (one <style> block per sidebar button plus each page's own block, both
+# copied below) vs. the single stylesheet from ui.styles.
+#
+#   python -m bench.bench_css_payload
+
+from ui.styles import SHEETS, stylesheet
+
+SIDEBAR_LABELS = [
+    "📜  Feed",
+    "📜  Personal Feed",
+    "👤  Update Profile",
+    "🔓  🚪 Sign out",
+]
+
+
+def legacy_button_css(full_label):
+    return f"""
+    <style>
+    div.stButton > button[title="{full_label}"] {{
+        display: flex;
+        align-items: center;
+        gap: 10px;
+        justify-content: flex-start;
+        width: 100%;
+        padding: 14px 18px;
+        margin: 8px 0;
+        font-size: 16px;
+        font-weight: 500;
+        color: white;
+        background: linear-gradient(90deg, #6a11cb, #2575fc);
+        border: none;
+        border-radius: 12px;
+        cursor: pointer;
+        box-shadow: 0 4px 8px rgba(0,0,0,0.15);
+        transition: all 0.3s ease;
+        text-align: left;
+    }}
+    div.stButton > button[title="{full_label}"]:hover {{
+        background: linear-gradient(90deg, #2575fc, #6a11cb);
+        transform: translateY(-2px);
+        box-shadow: 0 6px 14px rgba(0,0,0,0.25);
+    }}
+    </style>
+    """
+
+
+PAGES = {
+    "All Posts": ("posts", "feed"),
+    "My Posts": ("posts", "my_posts"),
+    "User Profile": ("profile",),
+}
+
+
+def main():
+    sidebar = sum(len(legacy_button_css(label).encode()) for label in SIDEBAR_LABELS)
+    print(f"{'page':<14}{'before':>10}{'after':>10}")
+    for page, names in PAGES.items():
+        # The old pages sent their block verbatim, indentation included
+        before = sidebar + sum(
+            len(f"\n    <style>{SHEETS[name]}</style>\n".encode()) for name in names
+        )
+        after = len(stylesheet("sidebar", *names).encode())
+        print(f"{page:<14}{before:>9}B{after:>9}B")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# bench/bench_post_memory.py
+#
+# Resident memory per 1k loaded posts: raw /posts JSON dicts (what
+# session_state used to hold) vs. core.records.PostRecord lists. Each
+# simulated session decodes its own copy of the payload, as it would after
+# its own HTTP fetch.
+#
+#   python -m bench.bench_post_memory [posts] [sessions]
+
+import gc
+import json
+import random
+import sys
+import tracemalloc
+
+from core.records import ingest
+
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua enim ad minim veniam"
+).split()
+
+
+def make_payload(n, owners=50):
+    # Every post gets its own body, as real posts do: repeated bodies would
+    # let sys.intern fold them together and flatter the records
+    rng = random.Random(7)
+    items = []
+    for i in range(n):
+        owner_id = i % owners
+        items.append(
+            {
+                "Post": {
+                    "id": i,
+                    "title": f"Post number {i} about something",
+                    "content": " ".join(rng.choices(WORDS, k=100 + i % 300)),
+                    "published": i % 7 != 0,
+                    "created_at": "2025-03-01T12:%02d:%02d.123456Z" % (i % 60, i % 60),
+                    "owner_id": owner_id,
+                    "owner": {
+                        "id": owner_id,
+                        "email": f"user{owner_id}@example.com",
+                        "first_name": f"First{owner_id}",
+                        "last_name": f"Last{owner_id}",
+                        "created_at": "2024-01-01T00:00:00Z",
+                    },
+                },
+                "votes": i % 13,
+                "user_voted": i % 5 == 0,
+            }
+        )
+    return json.dumps(items)
+
+
+def measure(build, sessions):
+    gc.collect()
+    tracemalloc.start()
+    held = [build() for _ in range(sessions)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return current
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    sessions = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    payload = make_payload(n)
+
+    print(f"{n} posts, {sessions} sessions")
+    for label, count in (("1 session", 1), (f"{sessions} sessions", sessions)):
+        raw = measure(lambda: json.loads(payload), count)
+        records = measure(lambda: ingest(json.loads(payload)), count)
+        per_k = 1000 / n / count / 1024
+        print(f"  {label}")
+        print(f"    raw JSON dicts : {raw * per_k:9.1f} KiB per 1k posts per session")
+        print(
+            f"    PostRecords    : {records * per_k:9.1f} KiB per 1k posts per session"
+        )
+        print(f"    saved          : {100 * (1 - records / raw):9.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# bench/bench_time_ago.py
+#
+# Micro-benchmark: per-card time_ago() as it used to run on every rerun vs.
+# parse-once ingest + one time_ago_batch() call per rerun.
+#
+#   python -m bench.bench_time_ago [posts] [reruns]
+
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from core.post_utils import parse_timestamp, time_ago_batch
+from core.records import ingest
+
+
+def legacy_time_ago(timestamp_str):
+    # The pre-pipeline implementation, kept verbatim for comparison
+    now = datetime.now(timezone.utc)
+    dt = None
+    ts = timestamp_str.rstrip("Z")
+    for fmt in ("%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S"):
+        try:
+            dt = datetime.strptime(ts, fmt)
+            dt = dt.replace(tzinfo=timezone.utc)
+            break
+        except ValueError:
+            continue
+    if dt is None:
+        return timestamp_str
+    seconds = int((now - dt).total_seconds())
+    if seconds < 60:
+        return f"{seconds} second{'s' if seconds != 1 else ''} ago"
+    minutes = seconds // 60
+    if minutes < 60:
+        return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
+    hours = minutes // 60
+    if hours < 24:
+        return f"{hours} hour{'s' if hours != 1 else ''} ago"
+    days = hours // 24
+    if days < 365:
+        return f"{days} day{'s' if days != 1 else ''} ago"
+    years = days // 365
+    return f"{years} year{'s' if years != 1 else ''} ago"
+
+
+def make_posts(n):
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    posts = []
+    for i in range(n):
+        created = base + timedelta(minutes=37 * i, microseconds=i)
+        # Mix both shapes the backend sends
+        stamp = created.strftime(
+            "%Y-%m-%dT%H:%M:%S" if i % 2 else "%Y-%m-%dT%H:%M:%S.%f"
+        )
+        posts.append(
+            {
+                "Post": {
+                    "id": i,
+                    "title": f"Post {i}",
+                    "content": "",
+                    "published": True,
+                    "owner_id": 1,
+                    "created_at": stamp + "Z",
+                },
+                "votes": 0,
+            }
+        )
+    return posts
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    reruns = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    items = make_posts(n)
+    stamps = [i["Post"]["created_at"] for i in items]
+
+    legacy = timeit.timeit(lambda: [legacy_time_ago(s) for s in stamps], number=reruns)
+
+    parse_timestamp.cache_clear()
+    records = []
+    ingest_time = timeit.timeit(lambda: records.extend(ingest(items)), number=1)
+    batch = timeit.timeit(lambda: time_ago_batch(records), number=reruns)
+
+    print(f"{n} posts x {reruns} reruns")
+    print(f"  legacy time_ago per card : {legacy * 1000 / reruns:8.3f} ms/rerun")
+    print(f"  ingest (once)            : {ingest_time * 1000:8.3f} ms")
+    print(f"  time_ago_batch           : {batch * 1000 / reruns:8.3f} ms/rerun")
+    print(f"  speedup per rerun        : {legacy / batch:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+# bench/stub_backend.py
+#
+# Deterministic in-process stand-in for the posts/users/vote/login API, for
+# the benchmarks. Same dataset for the same arguments, optional per-request
+# latency, and counters for the calls and bytes each scenario causes.
+#
+#   backend = StubBackend(posts=500, users=5, latency=0.02).start()
+#   os.environ["API_BASE_URL"] = backend.url
+
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+PASSWORD = "password"
+LISTS = ("/posts", "/posts/me")
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+WORDS = (
+    "streamlit python api cache latency feed post vote draft render page "
+    "session token backend query index search window batch profile"
+).split()
+
+
+def _iso(moment):
+    return moment.isoformat().replace("+00:00", "Z")
+
+
+def _created_key(item):
+    return (item["Post"]["created_at"], item["Post"]["id"])
+
+
+def _summarise(post, length):
+    # The post dicts in a listing are copies, so trimming them is safe
+    if len(post["content"]) > length:
+        post["content"] = post["content"][:length]
+        post["content_truncated"] = True
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+
+def token_for(user_id, ttl=3600):
+    # JWT-shaped like the real backend's tokens (user_id + exp claims); the
+    # signature part is a placeholder and is never checked
+    claims = {"user_id": user_id, "exp": int(time.time() + ttl)}
+    return f"{_b64({'alg': 'HS256', 'typ': 'JWT'})}.{_b64(claims)}.stub"
+
+
+def user_id_of(token):
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    payload = parts[1] + "=" * (-len(parts[1]) % 4)
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+    except ValueError:  # binascii.Error and JSONDecodeError included
+        return None
+    if claims.get("exp", 0) < time.time():
+        return None
+    return claims.get("user_id")
+
+
+class StubBackend:
+    def __init__(
+        self,
+        posts=200,
+        users=5,
+        latency=0.0,
+        seed=7,
+        since=True,
+        keyset=True,
+        summary=True,
+    ):
+        # Posts are spread evenly over the users, newest last. since=False,
+        # keyset=False and summary=False behave like a backend without delta,
+        # cursor paging or summary support (?since= / ?after= / ?summary=
+        # are ignored, not advertised).
+        self.latency = latency
+        self.since = since
+        self.keyset = keyset
+        self.summary = summary
+        self.lock = threading.Lock()
+        self.users = {
+            i: {
+                "id": i,
+                "email": f"user{i}@example.com",
+                "first_name": f"First{i}",
+                "last_name": f"Last{i}",
+                "created_at": _iso(EPOCH),
+            }
+            for i in range(1, users + 1)
+        }
+        rng = random.Random(seed)
+        self.posts = {}
+        for i in range(1, posts + 1):
+            self.posts[i] = {
+                "id": i,
+                "title": " ".join(rng.choices(WORDS, k=rng.randint(3, 8))).title(),
+                "content": " ".join(rng.choices(WORDS, k=rng.randint(20, 300))),
+                "published": rng.random() > 0.1,
+                "owner_id": (i - 1) % users + 1,
+                "created_at": _iso(EPOCH + timedelta(minutes=37 * i)),
+            }
+        self.votes = {
+            (rng.randint(1, users), rng.randint(1, posts)) for _ in range(posts)
+        }
+        self.reset_counters()
+        self._server = None
+
+    # -------------------- lifecycle --------------------
+    def start(self):
+        handler = type("Handler", (_Handler,), {"backend": self})
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def reset_counters(self):
+        with self.lock:
+            self.calls = []
+            self.bytes_sent = 0
+
+    def record(self, method, path, size):
+        with self.lock:
+            self.calls.append((method, path))
+            self.bytes_sent += size
+
+    # -------------------- views --------------------
+    def vote_counts(self):
+        return Counter(post_id for _, post_id in self.votes)
+
+    def item(self, post, viewer, counts=None):
+        counts = self.vote_counts() if counts is None else counts
+        return {
+            "Post": {**post, "owner": self.users[post["owner_id"]]},
+            "votes": counts[post["id"]],
+            "user_voted": (viewer, post["id"]) in self.votes,
+        }
+
+    def listing(self, viewer, query, mine):
+        # Drafts are only listed to their owner
+        posts = [
+            p
+            for p in self.posts.values()
+            if p["owner_id"] == viewer or (not mine and p["published"])
+        ]
+        search = query.get("search", "").lower()
+        if search:
+            posts = [p for p in posts if search in p["title"].lower()]
+        if query.get("start_date") and query.get("end_date"):
+            start, end = query["start_date"], query["end_date"]
+            posts = [p for p in posts if start <= p["created_at"][:10] <= end]
+        if query.get("since") and self.since:
+            # Inclusive, like a created_at >= filter: the caller drops what it has
+            posts = [p for p in posts if p["created_at"] >= query["since"]]
+        counts = self.vote_counts()
+        items = [self.item(p, viewer, counts) for p in posts]
+        sort = query.get("sort", "newest")
+        if sort == "popularity":
+            items.sort(key=lambda i: (-i["votes"], -i["Post"]["id"]))
+        else:
+            items.sort(key=_created_key, reverse=sort != "oldest")
+        limit = int(query.get("limit", 10))
+        if self.keyset and "after" in query:
+            after = (query["after"], int(query["after_id"]))
+            if sort == "popularity":
+                after = (int(after[0]), after[1])
+                items = [i for i in items if (i["votes"], i["Post"]["id"]) < after]
+            elif sort == "oldest":
+                items = [i for i in items if _created_key(i) > after]
+            else:
+                items = [i for i in items if _created_key(i) < after]
+        else:
+            skip = int(query.get("skip", 0))
+            items = items[skip:]
+        items = items[:limit]
+        if self.summary and query.get("summary"):
+            for i in items:
+                _summarise(i["Post"], int(query["summary"]))
+        return items
+
+
+class _Handler(BaseHTTPRequestHandler):
+    backend = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _viewer(self):
+        auth = self.headers.get("Authorization", "")
+        if not auth.startswith("Bearer "):
+            return None
+        user_id = user_id_of(auth[len("Bearer ") :])
+        return user_id if user_id in self.backend.users else None
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send(self, code, body=None):
+        data = b"" if body is None else json.dumps(body).encode()
+        headers = {"Content-Type": "application/json"}
+        if self.command == "GET" and urlsplit(self.path).path in LISTS:
+            modes = "keyset, offset" if self.backend.keyset else "offset"
+            headers["X-Pagination"] = modes
+        if self.command == "GET" and code == 200:
+            etag = '"%s"' % hashlib.sha1(data).hexdigest()
+            headers["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                code, data = 304, b""
+        self.send_response(code)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        self.backend.record(self.command, self.path, len(data))
+
+    def _dispatch(self, handler):
+        if self.backend.latency:
+            time.sleep(self.backend.latency)
+        with self.backend.lock:
+            code, body = handler()
+        self._send(code, body)
+
+    def do_GET(self):
+        self._dispatch(self._get)
+
+    def do_POST(self):
+        body = self._body()
+        self._dispatch(lambda: self._post(body))
+
+    def do_PATCH(self):
+        body = self._body()
+        self._dispatch(lambda: self._patch(body))
+
+    def do_DELETE(self):
+        self._body()
+        self._dispatch(self._delete)
+
+    # -------------------- routes --------------------
+    def _get(self):
+        viewer = self._viewer()
+        if viewer is None:
+            return 401, {"detail": "Could not validate credentials"}
+        parts = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        if parts.path == "/users/profile/me":
+            return 200, self.backend.users[viewer]
+        if parts.path in LISTS:
+            return 200, self.backend.listing(viewer, query, parts.path == "/posts/me")
+        if parts.path.startswith("/posts/"):
+            post = self.backend.posts.get(int(parts.path.rsplit("/", 1)[1]))
+            if post is None:
+                return 404, {"detail": "Post not found"}
+            return 200, self.backend.item(post, viewer)
+        return 404, {"detail": "Not Found"}
+
+    def _post(self, body):
+        if self.path == "/login":
+            form = {k: v[0] for k, v in parse_qs(body.decode()).items()}
+            for user in self.backend.users.values():
+                if (
+                    user["email"] == form.get("username")
+                    and form.get("password") == PASSWORD
+                ):
+                    token = token_for(user["id"])
+                    return 201, {"access_token": token, "token_type": "bearer"}
+            return 403, {"detail": "Invalid Credentials"}
+        data = json.loads(body or b"{}")
+        if self.path == "/users":
+            user_id = max(self.backend.users) + 1
+            self.backend.users[user_id] = {
+                "id": user_id,
+                "email": data.get("email", ""),
+                "first_name": data.get("first_name", ""),
+                "last_name": data.get("last_name", ""),
+                "created_at": _iso(datetime.now(timezone.utc)),
+            }
+            return 201, self.backend.users[user_id]
+        viewer = self._viewer()
+        if viewer is None:
+            return 401, {"detail": "Could not validate credentials"}
+        if self.path == "/vote":
+            key = (viewer, data["post_id"])
+            if data["dir"] == 1:
+                self.backend.votes.add(key)
+            else:
+                self.backend.votes.discard(key)
+            return 201, {"message": "ok"}
+        if self.path == "/posts":
+            post_id = max(self.backend.posts, default=0) + 1
+            self.backend.posts[post_id] = {
+                "id": post_id,
+                "title": data["title"],
+                "content": data["content"],
+                "published": data.get("published", True),
+                "owner_id": viewer,
+                "created_at": _iso(datetime.now(timezone.utc)),
+            }
+            return 201, self.backend.item(self.backend.posts[post_id], viewer)["Post"]
+        return 404, {"detail": "Not Found"}
+
+    def _patch(self, body):
+        viewer = self._viewer()
+        if viewer is None:
+            return 401, {"detail": "Could not validate credentials"}
+        data = json.loads(body or b"{}")
+        kind, _, raw_id = self.path.strip("/").partition("/")
+        target = {"posts": self.backend.posts, "users": self.backend.users}.get(
+            kind, {}
+        )
+        record = target.get(int(raw_id)) if raw_id.isdigit() else None
+        if record is None:
+            return 404, {"detail": "Not Found"}
+        record.update(data)
+        if kind == "posts":
+            return 200, self.backend.item(record, viewer)["Post"]
+        return 200, record
+
+    def _delete(self):
+        viewer = self._viewer()
+        if viewer is None:
+            return 401, {"detail": "Could not validate credentials"}
+        kind, _, raw_id = self.path.strip("/").partition("/")
+        target = {"posts": self.backend.posts, "users": self.backend.users}.get(
+            kind, {}
+        )
+        if target.pop(int(raw_id), None) is None:
+            return 404, {"detail": "Not Found"}
+        return 204, None
@@ -1,7 +1,59 @@
-import requests
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
 import streamlit as st
-from core.config import API_BASE_URL
-from core.auth import auth_header, logout
+from requests import Response
+
+from core import metrics
+from core.auth import auth_header, clear_profile_cache, logout
+from core.client import request
+from core.config import (
+    FANOUT_WORKERS,
+    SINGLEFLIGHT_WAIT_TIMEOUT,
+    USERS_ENDPOINT,
+    VOTE_ENDPOINT,
+)
+from core.feed_cache import feed_cache, page_key
+from core.response_cache import identity_of, response_cache
+from core.singleflight import SingleFlight
+
+_fanout = ThreadPoolExecutor(max_workers=FANOUT_WORKERS, thread_name_prefix="fanout")
+
+# Stands in for the HTTP response when the shared feed cache answers a GET
+_SHARED_HIT = Response()
+_SHARED_HIT.status_code = 200
+
+# Identical GETs (same endpoint and identity) in flight at the same time,
+# from any session, go out once
+_inflight = SingleFlight()
+
+# Paging modes the backend has advertised (X-Pagination: keyset, offset)
+_pagination = set()
+
+# Set while deferred_errors() is active on this (script) thread
+_deferred = threading.local()
+
+
+@contextmanager
+def deferred_errors():
+    # For on_click callbacks during a fragment rerun, which can't draw:
+    # request errors are collected into the yielded list instead of shown
+    errors = []
+    _deferred.errors = errors
+    try:
+        yield errors
+    finally:
+        _deferred.errors = None
+
+
+def _show_error(message):
+    errors = getattr(_deferred, "errors", None)
+    if errors is None:
+        st.error(message)
+    else:
+        errors.append(message)
 
 
 def _handle_response(response):
@@ -17,32 +69,140 @@ def _handle_response(response):
             detail = "Request failed"
 
         # Display in Streamlit instead of crashing
-        st.error(f"❌ {detail}")
+        _show_error(f"❌ {detail}")
         return None
 
     # Success
     return response.json() if response.content else None
 
 
+def _timer(method, endpoint):
+    # Tagged by endpoint template and status; "source" tells backend round
+    # trips from shared-cache hits and coalesced waits
+    return metrics.timer(
+        "api_request_seconds",
+        method=method,
+        endpoint=metrics.endpoint_template(endpoint),
+        status="error",
+        source="backend",
+    )
+
+
+def fetch_json(endpoint, headers):
+    # No Streamlit calls in here, so worker threads can use it as well
+    with _timer("GET", endpoint) as tags:
+        identity = identity_of(headers)
+        page = page_key(endpoint)
+        if page is not None:
+            shared = feed_cache.lookup(page, identity)
+            if shared is not None:
+                tags.update(status=200, source="shared")
+                return _SHARED_HIT, shared
+
+        key = (endpoint, identity)
+        (response, data), coalesced = _inflight.do(
+            key, lambda: _fetch(key, headers, page), SINGLEFLIGHT_WAIT_TIMEOUT
+        )
+        tags["status"] = response.status_code
+        if coalesced:
+            tags["source"] = "coalesced"
+        return response, copy.deepcopy(data) if coalesced else data
+
+
+def _fetch(key, headers, page):
+    endpoint, identity = key
+    headers = {**headers, **response_cache.validators(key)}
+    response = request("GET", endpoint, headers=headers)
+    advertised = response.headers.get("X-Pagination")
+    if advertised:
+        _pagination.update(mode.strip() for mode in advertised.split(","))
+    data = None
+    if response.status_code == 304:
+        data = response_cache.hit(key)
+    if data is None:
+        with metrics.timer(
+            "json_decode_seconds", endpoint=metrics.endpoint_template(endpoint)
+        ):
+            data = response.json() if response.ok and response.content else None
+        response_cache.store(key, response, data)
+    if page is not None and (response.ok or response.status_code == 304):
+        feed_cache.store(page, identity, data)
+    return response, data
+
+
+def supports_pagination(mode):
+    return mode in _pagination
+
+
 def get(endpoint):
-    response = requests.get(f"{API_BASE_URL}{endpoint}", headers=auth_header())
+    return handle_fetched(*fetch_json(endpoint, auth_header()))
+
+
+def handle_fetched(response, data):
+    # What get() returns for a fetch_json() result, e.g. one made on a worker
+    # thread; errors are reported here, so call it on the script thread
+    if response.ok:
+        return data
     return _handle_response(response)
 
 
+def get_many(*endpoints):
+    # Issues independent GETs concurrently and returns their results in order.
+    # Only the HTTP part runs on the pool; each response still goes through
+    # _handle_response on the script thread, exactly like get().
+    if len(endpoints) < 2:
+        return [get(endpoint) for endpoint in endpoints]
+    headers = auth_header()
+    fetch = metrics.bind(fetch_json)
+    futures = [_fanout.submit(fetch, endpoint, headers) for endpoint in endpoints]
+    results = []
+    for future in futures:
+        results.append(handle_fetched(*future.result()))
+    return results
+
+
+def cache_stats():
+    return {
+        "responses": dict(response_cache.stats),
+        "feed": {**feed_cache.stats, "hit_ratio": feed_cache.hit_ratio()},
+        "inflight": dict(_inflight.stats),
+    }
+
+
+def send_json(endpoint, payload, headers):
+    # POST without Streamlit calls, for worker threads (see core.vote_queue)
+    with _timer("POST", endpoint) as tags:
+        response = request("POST", endpoint, json=payload, headers=headers)
+        tags["status"] = response.status_code
+    if response.ok:
+        feed_cache.invalidate(identity_of(headers))
+        if endpoint == VOTE_ENDPOINT:
+            feed_cache.remember_vote(
+                identity_of(headers), payload["post_id"], payload["dir"] == 1
+            )
+    return response
+
+
 def post(endpoint, payload=None):
-    response = requests.post(
-        f"{API_BASE_URL}{endpoint}", json=payload, headers=auth_header()
-    )
-    return _handle_response(response)
+    return _handle_response(send_json(endpoint, payload, auth_header()))
 
 
 def patch(endpoint, payload=None):
-    response = requests.patch(
-        f"{API_BASE_URL}{endpoint}",
-        json=payload,
-        headers=auth_header(),
-    )
-    return _handle_response(response)
+    headers = auth_header()
+    with _timer("PATCH", endpoint) as tags:
+        response = request(
+            "PATCH",
+            endpoint,
+            json=payload,
+            headers=headers,
+        )
+        tags["status"] = response.status_code
+    result = _handle_response(response)
+    if response.ok:
+        feed_cache.invalidate(identity_of(headers))
+    if result is not None and endpoint.startswith(f"{USERS_ENDPOINT}/"):
+        clear_profile_cache()
+    return result
 
 
 # def delete(endpoint):
@@ -52,8 +212,15 @@ def patch(endpoint, payload=None):
 
 
 def delete(url, data=None):
-    return requests.delete(
-        API_BASE_URL + url,
-        json=data,
-        headers=auth_header(),
-    )
+    headers = auth_header()
+    with _timer("DELETE", url) as tags:
+        response = request(
+            "DELETE",
+            url,
+            json=data,
+            headers=headers,
+        )
+        tags["status"] = response.status_code
+    if response.ok:
+        feed_cache.invalidate(identity_of(headers))
+    return response
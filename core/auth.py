@@ -1,4 +1,43 @@
+import base64
+import json
+import time
+
 import streamlit as st
+from core.config import TOKEN_EXPIRY_LEEWAY
+
+PROFILE_CACHE_KEY = "_profile_cache"
+
+
+def _decode_claims(token):
+    parts = token.split(".")
+    if len(parts) != 3:
+        return {}
+    payload = parts[1] + "=" * (-len(parts[1]) % 4)
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+    except ValueError:  # binascii.Error and JSONDecodeError included
+        return {}
+    return claims if isinstance(claims, dict) else {}
+
+
+def token_claims(token):
+    # The JWT payload, read locally. The signature is NOT verified: the
+    # backend still checks every request, this only saves round trips.
+    return _decode_claims(token) if token else {}
+
+
+def token_expired(token):
+    # True once "exp" is (about to be) in the past; tokens without it never
+    # expire as far as we can tell
+    exp = token_claims(token).get("exp")
+    if not isinstance(exp, (int, float)):
+        return False
+    return exp <= time.time() + TOKEN_EXPIRY_LEEWAY
+
+
+def _end_expired_session():
+    st.error("Session expired. Please login again.")
+    logout()
 
 
 def init_auth():
@@ -13,6 +52,8 @@ def is_authenticated():
 def require_auth():
     if not is_authenticated():
         st.switch_page("app.py")
+    if token_expired(st.session_state.get("access_token")):
+        _end_expired_session()
 
 
 def login_success(token):
@@ -20,7 +61,12 @@ def login_success(token):
     st.session_state["authenticated"] = True
 
 
+def clear_profile_cache():
+    st.session_state.pop(PROFILE_CACHE_KEY, None)
+
+
 def logout():
+    clear_profile_cache()
     st.session_state.clear()
     st.switch_page("app.py")
 
@@ -30,4 +76,7 @@ def auth_header():
     if not token:
         st.error("Please login again.")
         st.stop()
+    # Don't send a request the backend is bound to answer with 401
+    if token_expired(token):
+        _end_expired_session()
     return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,63 @@
+# core/bodies.py
+
+# Full post bodies behind "Read more". With SUMMARY_LENGTH set, list
+# requests ask the backend for summaries (?summary=N) and records keep only
+# that; a post whose body was cut (PostRecord.truncated) gets its full text
+# from GET /posts/{id} on demand, through one LRU shared by the process.
+# Only published bodies are shared: drafts are fetched each time.
+
+import threading
+from collections import OrderedDict
+
+from core.api import get
+from core.config import BODY_CACHE_SIZE, POSTS_ENDPOINT
+
+
+class BodyCache:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, post_id):
+        with self._lock:
+            body = self._entries.get(post_id)
+            if body is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(post_id)
+            self.stats["hits"] += 1
+            return body
+
+    def put(self, post_id, body):
+        with self._lock:
+            self._entries[post_id] = body
+            self._entries.move_to_end(post_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def forget(self, post_id):
+        with self._lock:
+            self._entries.pop(post_id, None)
+
+
+bodies = BodyCache(BODY_CACHE_SIZE)
+
+
+def full_body(record):
+    # The whole text of a PostRecord, or None if it couldn't be fetched
+    # (already reported by core.api)
+    if not record.truncated:
+        return record.content
+    body = bodies.get(record.id)
+    # A summary that no longer starts the cached body means it was edited
+    if body is None or not body.startswith(record.content):
+        item = get(f"{POSTS_ENDPOINT}/{record.id}")
+        if item is None:
+            return None
+        post = item.get("Post", item)
+        body = post["content"]
+        if post.get("published", record.published):
+            bodies.put(record.id, body)
+    return body
@@ -0,0 +1,65 @@
+# core/client.py
+
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from core.config import (
+    API_BASE_URL,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_READ_TIMEOUT,
+)
+
+# One pooled session per server process. Streamlit runs every session's script
+# on its own thread, so creation is guarded and the session is never mutated
+# after it is built (urllib3 connection pools are thread-safe).
+_session = None
+_session_lock = threading.Lock()
+
+
+class _PooledSession(requests.Session):
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT))
+        return super().request(method, url, **kwargs)
+
+
+def _build_session():
+    session = _PooledSession()
+    # pool_connections: how many hosts keep their own keep-alive pool
+    # pool_maxsize: connections kept alive per host
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        pool_block=False,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    # The session is shared by every user, so it must never carry cookies
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def request(method, endpoint, **kwargs):
+    return get_session().request(method, f"{API_BASE_URL}{endpoint}", **kwargs)
+
+
+def close():
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
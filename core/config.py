@@ -1,16 +1,135 @@
 import os
+from dataclasses import dataclass, fields
 
-try:
-    from dotenv import load_dotenv
-except ImportError:
-    load_dotenv = None
 
-if load_dotenv:
-    load_dotenv()
+def _load_dotenv():
+    # Only when there is a .env to read; the explicit path also skips
+    # python-dotenv's search up the call stack
+    path = os.path.join(os.getcwd(), ".env")
+    if not os.path.exists(path):
+        return
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    load_dotenv(path)
 
-API_BASE_URL = os.getenv("API_BASE_URL", "http://127.0.0.1:8000")
+
+# Read once per process into an immutable object; every module sees the same
+# values for the life of the server
+@dataclass(frozen=True, slots=True)
+class Settings:
+    API_BASE_URL: str = "http://127.0.0.1:8000"
+
+    # HTTP client pool (shared by every session in the server process)
+    HTTP_POOL_CONNECTIONS: int = 4
+    HTTP_POOL_MAXSIZE: int = 32
+    HTTP_CONNECT_TIMEOUT: float = 3.05
+    HTTP_READ_TIMEOUT: float = 15.0
+
+    # Seconds the /users/profile/me response is reused within a session
+    PROFILE_CACHE_TTL: float = 300.0
+
+    # A token this close to its "exp" claim is treated as expired already
+    TOKEN_EXPIRY_LEEWAY: float = 5.0
+
+    # Post cards rendered per page of the windowed feed, and how many cards'
+    # pre-rendered heads the process keeps (ui.cards)
+    FEED_WINDOW_SIZE: int = 20
+    CARD_CACHE_SIZE: int = 2048
+
+    # Posts per request when paging through My Posts
+    MY_POSTS_PAGE_SIZE: int = 20
+
+    # Threads used to issue a page's independent initial GETs concurrently
+    FANOUT_WORKERS: int = 16
+
+    # How long a fully loaded feed may answer search/sort/date filters locally
+    FEED_INDEX_TTL: float = 120.0
+
+    # Background workers that fetch the next feed batch ahead of "Load More"
+    PREFETCH_WORKERS: int = 8
+    PREFETCH_WAIT_TIMEOUT: float = 15.0
+
+    # Feed search: wait this long for a newer query before hitting the
+    # backend (env: SEARCH_DEBOUNCE_MS), and keep the first page of recent
+    # queries per session
+    SEARCH_DEBOUNCE: float = 0.3
+    SEARCH_CACHE_SIZE: int = 16
+    SEARCH_CACHE_TTL: float = 60.0
+    SEARCH_WORKERS: int = 8
+
+    # Feed pages shared by every session in the process (per-viewer vote
+    # flags are kept apart); any write through core.api drops them
+    FEED_CACHE_TTL: float = 30.0
+    FEED_CACHE_MAX_ENTRIES: int = 256
+    FEED_CACHE_MAX_VIEWERS: int = 1024
+
+    # "N new posts" check on the Newest feed (core.delta); 0 turns it off.
+    # More than FEED_SYNC_MAX_PAGES pages of news reloads the feed instead.
+    FEED_SYNC_INTERVAL: float = 30.0
+    FEED_SYNC_PAGE_SIZE: int = 10
+    FEED_SYNC_MAX_PAGES: int = 3
+
+    # List requests ask for bodies cut to SUMMARY_LENGTH characters
+    # (?summary=N; 0 asks for full bodies); "Read more" fetches the rest
+    # through a process-wide LRU of BODY_CACHE_SIZE bodies (core.bodies)
+    SUMMARY_LENGTH: int = 250
+    BODY_CACHE_SIZE: int = 256
+
+    # Page lists by (sort key, id) cursor once the backend advertises it
+    # (X-Pagination: keyset); 0 always pages by skip offsets
+    KEYSET_PAGINATION: bool = True
+
+    # Longest a GET waits on an identical request already in flight
+    SINGLEFLIGHT_WAIT_TIMEOUT: float = 20.0
+
+    # Conditional GET (ETag / Last-Modified) cache, shared by the process
+    RESPONSE_CACHE_MAX_ENTRIES: int = 512
+
+    # Write-behind votes (core.vote_queue): toggles are sent this long after
+    # the last one, by a process-wide pool, with retries on 5xx/429/network
+    VOTE_FLUSH_DELAY: float = 0.3
+    VOTE_WORKERS: int = 4
+    VOTE_RETRIES: int = 3
+    VOTE_RETRY_BACKOFF: float = 0.25
+    VOTE_POLL_INTERVAL: float = 1.0
+
+    # Request/phase timing histograms and the ?debug=1 sidebar panel
+    # (off: free)
+    METRICS_ENABLED: bool = False
+
+    @classmethod
+    def from_env(cls):
+        _load_dotenv()
+        values = {}
+        for field in fields(cls):
+            raw = os.environ.get(field.name)
+            if raw is None:
+                continue
+            if field.type is bool:
+                values[field.name] = raw == "1"
+            else:
+                values[field.name] = field.type(raw)
+        debounce_ms = os.environ.get("SEARCH_DEBOUNCE_MS")
+        if debounce_ms is not None:
+            values["SEARCH_DEBOUNCE"] = float(debounce_ms) / 1000
+        return cls(**values)
+
+
+settings = Settings.from_env()
+
+
+def __getattr__(name):
+    # Keeps `from core.config import API_BASE_URL` working for every setting
+    try:
+        return getattr(settings, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
 
 
 LOGIN_ENDPOINT = "/login"
 USERS_ENDPOINT = "/users"
 POSTS_ENDPOINT = "/posts"
+PROFILE_ENDPOINT = "/users/profile/me"
+VOTE_ENDPOINT = "/vote"
@@ -0,0 +1,43 @@
+# core/delta.py
+
+# "What's new" for a newest-first list, without reloading it from skip=0.
+# The request carries ?since=<created_at of the newest post held>; a backend
+# that knows the parameter sends only newer posts, one that doesn't sends the
+# usual newest-first page. Either way items are kept only while they are
+# newer than that post, and reading stops at the first one that isn't.
+
+from core.api import fetch_json
+from core.auth import auth_header
+from core.post_utils import parse_timestamp
+
+
+def _mark(created_at, post_id):
+    return (parse_timestamp(created_at) or 0.0, post_id)
+
+
+def newest(records):
+    # The newest PostRecord held, or None
+    return max(records, key=lambda r: _mark(r.created_at, r.id), default=None)
+
+
+# endpoint_at(skip, since) builds the list endpoint. Returns (items, more):
+# the new items newest first, and whether max_pages ran out before reaching
+# known posts. A failed request returns ([], False) without reporting
+# anything, since the caller is a background check the user didn't ask for.
+def fetch_newer(endpoint_at, latest, page_size, max_pages):
+    since = latest.created_at
+    mark = _mark(since, latest.id)
+    headers = auth_header()
+    newer = []
+    for page in range(max_pages):
+        response, items = fetch_json(endpoint_at(page * page_size, since), headers)
+        if not response.ok or items is None:
+            return [], False
+        for item in items:
+            post = item.get("Post", item)
+            if _mark(post["created_at"], post["id"]) <= mark:
+                return newer, False
+            newer.append(item)
+        if len(items) < page_size:
+            return newer, False
+    return newer, True
@@ -0,0 +1,144 @@
+# core/feed_cache.py
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlsplit
+
+from core.config import (
+    FEED_CACHE_MAX_ENTRIES,
+    FEED_CACHE_MAX_VIEWERS,
+    FEED_CACHE_TTL,
+    POSTS_ENDPOINT,
+)
+
+
+def page_key(endpoint):
+    # Every query parameter of a /posts list request (filters, offset or
+    # keyset cursor, delta "since", summary length), None for anything else
+    parts = urlsplit(endpoint)
+    if parts.path != POSTS_ENDPOINT:
+        return None
+    query = {name: values[0] for name, values in parse_qs(parts.query).items()}
+    return tuple(
+        query.get(name, "")
+        for name in (
+            "sort",
+            "search",
+            "start_date",
+            "end_date",
+            "skip",
+            "limit",
+            "after",
+            "after_id",
+            "since",
+            "summary",
+        )
+    )
+
+
+# Process-wide cache of feed pages, shared by every session. The shared part
+# of an entry is only what every viewer gets back (posts and vote counts);
+# each viewer's user_voted flags live in a separate per-identity overlay and
+# are put back on the way out.
+#
+# A viewer's own listing can differ from everyone else's: drafts are only
+# listed to their owner. So a viewer is only served a shared page whose key
+# they have fetched themselves before and found draft-free ("clean"), and
+# only if their overlay has a flag for every post on it; anything else is a
+# miss, and their fetch refreshes both. Clean keys survive invalidate(), so
+# after a write the first viewer to refetch a page serves everyone who has
+# read it before, but a viewer's own writes (which may create, publish or
+# delete a draft) forget theirs. Any write made through core.api drops
+# every page.
+class FeedCache:
+    def __init__(self, ttl, max_entries, max_viewers):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_viewers = max_viewers
+        self._pages = OrderedDict()
+        self._overlays = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidate(), i.e. every write made through core.api;
+        # other caches of list data compare it to drop what they stored before
+        self.generation = 0
+        self.stats = {"hits": 0, "misses": 0, "viewer_misses": 0}
+
+    def _overlay(self, identity):
+        overlay = self._overlays.get(identity)
+        if overlay is None:
+            overlay = self._overlays[identity] = {"votes": {}, "clean": OrderedDict()}
+            while len(self._overlays) > self.max_viewers:
+                self._overlays.popitem(last=False)
+        self._overlays.move_to_end(identity)
+        return overlay
+
+    def lookup(self, key, identity):
+        with self._lock:
+            entry = self._pages.get(key)
+            if entry is None or entry["expires_at"] < time.monotonic():
+                self.stats["misses"] += 1
+                return None
+            overlay = self._overlay(identity)
+            votes = overlay["votes"]
+            if key not in overlay["clean"] or any(
+                post["id"] not in votes for post, _ in entry["items"]
+            ):
+                self.stats["viewer_misses"] += 1
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            self._pages.move_to_end(key)
+            overlay["clean"].move_to_end(key)
+            items = entry["items"]
+            voted = [votes[post["id"]] for post, _ in items]
+        return [
+            {"Post": copy.deepcopy(post), "votes": votes, "user_voted": user_voted}
+            for (post, votes), user_voted in zip(items, voted)
+        ]
+
+    def store(self, key, identity, data):
+        if not isinstance(data, list):
+            return
+        with self._lock:
+            overlay = self._overlay(identity)
+            for item in data:
+                overlay["votes"][item["Post"]["id"]] = item.get("user_voted", False)
+            clean = overlay["clean"]
+            if any(not item["Post"].get("published", True) for item in data):
+                clean.pop(key, None)
+                return
+            clean[key] = True
+            clean.move_to_end(key)
+            while len(clean) > self.max_entries:
+                clean.popitem(last=False)
+            self._pages[key] = {
+                "expires_at": time.monotonic() + self.ttl,
+                "items": [
+                    (copy.deepcopy(item["Post"]), item.get("votes", 0)) for item in data
+                ],
+            }
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_entries:
+                self._pages.popitem(last=False)
+
+    def remember_vote(self, identity, post_id, voted):
+        with self._lock:
+            self._overlay(identity)["votes"][post_id] = voted
+
+    def invalidate(self, identity=None):
+        # identity: whoever wrote, whose own listings may have changed
+        with self._lock:
+            self._pages.clear()
+            self.generation += 1
+            overlay = self._overlays.get(identity)
+            if overlay is not None:
+                overlay["clean"].clear()
+
+    def hit_ratio(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+
+feed_cache = FeedCache(FEED_CACHE_TTL, FEED_CACHE_MAX_ENTRIES, FEED_CACHE_MAX_VIEWERS)
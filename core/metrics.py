@@ -0,0 +1,189 @@
+# core/metrics.py
+
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from core.config import METRICS_ENABLED
+
+# Upper bounds in seconds; the last bucket catches everything slower
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, float("inf"))
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+_local = threading.local()
+
+
+def endpoint_template(endpoint):
+    # "/posts/42?x=1" -> "/posts/{id}", so labels stay low-cardinality
+    return _ID_SEGMENT.sub("/{id}", endpoint.split("?", 1)[0])
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        self.total += seconds
+        self.count += 1
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS, self.counts):
+            seen += n
+            if n and seen >= rank:
+                return bound
+        return 0.0
+
+
+# Histograms by (metric name, sorted label pairs). One lives for the whole
+# process and one in each session's state; worker threads write to both.
+class Registry:
+    def __init__(self):
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, labels, seconds):
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = Histogram()
+            series.observe(seconds)
+
+    def snapshot(self):
+        with self._lock:
+            return [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "buckets": list(h.counts),
+                    "sum": h.total,
+                    "count": h.count,
+                    "p50": h.quantile(0.5),
+                    "p95": h.quantile(0.95),
+                }
+                for (name, labels), h in sorted(self._series.items())
+            ]
+
+
+process_registry = Registry()
+
+
+def _session_registry():
+    # The calling session's registry; None off the script thread
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return None
+    if "_metrics" not in st.session_state:
+        st.session_state["_metrics"] = Registry()
+    return st.session_state["_metrics"]
+
+
+def session_registry():
+    return _session_registry() if METRICS_ENABLED else None
+
+
+def record(name, labels, seconds):
+    process_registry.observe(name, labels, seconds)
+    registry = getattr(_local, "session", None) or _session_registry()
+    if registry is not None:
+        registry.observe(name, labels, seconds)
+
+
+class _Noop:
+    def __enter__(self):
+        return {}
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _Noop()
+
+
+@contextmanager
+def _timed(name, labels):
+    start = time.perf_counter()
+    try:
+        yield labels
+    finally:
+        record(name, labels, time.perf_counter() - start)
+
+
+def timer(name, **labels):
+    # with timer("api_request_seconds", method="GET") as tags:
+    #     ...; tags["status"] = 200
+    # Free when metrics are off: the shared no-op is returned as is
+    if not METRICS_ENABLED:
+        return _NOOP
+    return _timed(name, labels)
+
+
+def phase(page, name):
+    return timer("page_phase_seconds", page=page, phase=name)
+
+
+def bind(fn):
+    # Wraps fn for a worker pool so its timings also land in the submitting
+    # session's histograms, not only the process-wide ones
+    if not METRICS_ENABLED:
+        return fn
+    registry = _session_registry()
+
+    def bound(*args, **kwargs):
+        _local.session = registry
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _local.session = None
+
+    return bound
+
+
+# -------------------- exporters --------------------
+def _label_text(labels, **extra):
+    pairs = {**labels, **extra}
+    return ",".join(f'{k}="{v}"' for k, v in pairs.items())
+
+
+def to_prometheus(registry=process_registry):
+    lines = []
+    seen = set()
+    for series in registry.snapshot():
+        name, labels = series["name"], series["labels"]
+        if name not in seen:
+            seen.add(name)
+            lines.append(f"# TYPE {name} histogram")
+        cumulative = 0
+        for bound, n in zip(BUCKETS, series["buckets"]):
+            cumulative += n
+            le = "+Inf" if bound == float("inf") else bound
+            lines.append(f"{name}_bucket{{{_label_text(labels, le=le)}}} {cumulative}")
+        lines.append(f"{name}_sum{{{_label_text(labels)}}} {series['sum']}")
+        lines.append(f"{name}_count{{{_label_text(labels)}}} {series['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def to_jsonl(registry=process_registry):
+    now = time.time()
+    lines = []
+    for series in registry.snapshot():
+        del series["buckets"]
+        for q in ("p50", "p95"):
+            if series[q] == float("inf"):
+                series[q] = None  # slower than the last finite bucket
+        lines.append(json.dumps({"ts": now, **series}) + "\n")
+    return "".join(lines)
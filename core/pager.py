@@ -0,0 +1,19 @@
+# core/pager.py
+
+from urllib.parse import quote
+
+from core.api import supports_pagination
+from core.config import KEYSET_PAGINATION
+
+
+# "after=...&after_id=..." continuing a list sorted by sort ("newest",
+# "oldest" or "popularity") after item, the last raw list entry already
+# received; None means page by offset. The key is (created_at, id), or
+# (votes, id) for popularity, as the backend sent them: unlike an offset it
+# doesn't shift when posts are created or deleted in between.
+def cursor_after(item, sort):
+    if item is None or not KEYSET_PAGINATION or not supports_pagination("keyset"):
+        return None
+    post = item.get("Post", item)
+    value = item.get("votes", 0) if sort == "popularity" else post["created_at"]
+    return f"after={quote(str(value), safe='')}&after_id={post['id']}"
@@ -0,0 +1,119 @@
+# core/post_index.py
+
+import bisect
+import time
+from collections import defaultdict
+from datetime import date
+
+
+# Incrementally built index over every feed post a session has loaded.
+# Entries are the same PostRecords held in st.session_state.posts_loaded, so
+# in-place mutations are visible here; call refresh()/remove() after a
+# successful write so the derived keys (title, vote order, drafts) follow.
+class PostIndex:
+    def __init__(self):
+        self.by_id = {}
+        self._keys = {}
+        self._owners = defaultdict(set)
+        self._drafts = set()
+        self._by_created = []  # sorted (created_ts, id)
+        self._by_votes = []  # sorted (votes, id)
+        self._complete_until = 0.0
+
+    def __len__(self):
+        return len(self.by_id)
+
+    # -------------------- maintenance --------------------
+    def add(self, records):
+        for record in records:
+            if record.id in self.by_id:
+                self.remove(record.id)
+            self.by_id[record.id] = record
+            self._index(record)
+
+    def refresh(self, post_id):
+        record = self.by_id.get(post_id)
+        if record is not None:
+            self._unindex(post_id)
+            self._index(record)
+
+    def remove(self, post_id):
+        if self.by_id.pop(post_id, None) is not None:
+            self._unindex(post_id)
+
+    def _index(self, record):
+        post_id = record.id
+        keys = {
+            "title": record.title.lower(),
+            "owner": record.owner_id,
+            "created": (record.created_ts or 0.0, post_id),
+            "votes": (record.votes, post_id),
+            "day": date.fromisoformat(record.created_at[:10]),
+        }
+        self._keys[post_id] = keys
+        self._owners[keys["owner"]].add(post_id)
+        if not record.published:
+            self._drafts.add(post_id)
+        bisect.insort(self._by_created, keys["created"])
+        bisect.insort(self._by_votes, keys["votes"])
+
+    def _unindex(self, post_id):
+        keys = self._keys.pop(post_id)
+        self._owners[keys["owner"]].discard(post_id)
+        self._drafts.discard(post_id)
+        self._discard_sorted(self._by_created, keys["created"])
+        self._discard_sorted(self._by_votes, keys["votes"])
+
+    @staticmethod
+    def _discard_sorted(view, key):
+        pos = bisect.bisect_left(view, key)
+        if pos < len(view) and view[pos] == key:
+            del view[pos]
+
+    # -------------------- completeness --------------------
+    # "Complete" means an unfiltered feed was paged to its end, so every post
+    # the user can see is in here. It expires so other users' new posts
+    # eventually show up again.
+    def mark_complete(self, ttl):
+        self._complete_until = time.monotonic() + ttl
+
+    def invalidate(self):
+        self._complete_until = 0.0
+
+    def is_complete(self):
+        return time.monotonic() < self._complete_until
+
+    # -------------------- queries --------------------
+    def query(self, search="", sort="Newest", date_range=(), drafts_of=None):
+        ids = None
+        if search:
+            # Same rule as the backend's ?search=: a case-insensitive
+            # substring of the title, so a complete index answers exactly
+            # what a request would
+            needle = search.lower()
+            ids = {
+                post_id
+                for post_id, keys in self._keys.items()
+                if needle in keys["title"]
+            }
+        if drafts_of is not None:
+            drafts = self._owners[drafts_of] & self._drafts
+            ids = drafts if ids is None else ids & drafts
+        if date_range and len(date_range) == 2:
+            start, end = date_range
+            in_range = {
+                post_id
+                for post_id in (self.by_id if ids is None else ids)
+                if start <= self._keys[post_id]["day"] <= end
+            }
+            ids = in_range
+
+        view_key = "votes" if sort == "Popularity" else "created"
+        if ids is None:
+            view = self._by_votes if view_key == "votes" else self._by_created
+            ordered = [post_id for _, post_id in view]
+        else:
+            ordered = sorted(ids, key=lambda post_id: self._keys[post_id][view_key])
+        if sort != "Oldest":
+            ordered.reverse()
+        return [self.by_id[post_id] for post_id in ordered]
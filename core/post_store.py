@@ -0,0 +1,69 @@
+# core/post_store.py
+
+# Local mutations of the loaded feed lists (st.session_state.posts_loaded /
+# my_posts_loaded, lists of core.records.PostRecord). Each action is applied
+# in place first and rolled back if the API call fails, so a write costs one
+# request instead of a request plus a reload of everything the user has
+# paged through. Votes don't go through here: core.vote_queue sends them
+# in the background.
+
+from contextlib import contextmanager
+
+from core.api import delete, patch, post
+from core.bodies import bodies
+from core.records import to_record
+
+
+def index_of(posts, post_id):
+    for idx, record in enumerate(posts):
+        if record.id == post_id:
+            return idx
+    return None
+
+
+@contextmanager
+def _optimistic(posts, post_id):
+    idx = index_of(posts, post_id)
+    record = posts[idx] if idx is not None else None
+    snapshot = record.snapshot() if record is not None else None
+    outcome = {"ok": False, "item": record}
+    try:
+        yield outcome
+    finally:
+        if not outcome["ok"] and record is not None:
+            # Restore in place: card fragments hold on to the record
+            record.restore(snapshot)
+            if index_of(posts, post_id) is None:
+                posts.insert(min(idx, len(posts)), record)
+
+
+def update_post(posts, post_id, fields):
+    with _optimistic(posts, post_id) as outcome:
+        if outcome["item"] is not None:
+            outcome["item"].update(fields)
+        outcome["ok"] = patch(f"/posts/{post_id}", fields) is not None
+    if outcome["ok"] and "content" in fields:
+        bodies.forget(post_id)
+    return outcome["ok"]
+
+
+def delete_post(posts, post_id):
+    with _optimistic(posts, post_id) as outcome:
+        if outcome["item"] is not None:
+            posts.remove(outcome["item"])
+        outcome["ok"] = delete(f"/posts/{post_id}").ok
+    if outcome["ok"]:
+        bodies.forget(post_id)
+    return outcome["ok"]
+
+
+def create_post(title, content, published):
+    return post("/posts", {"title": title, "content": content, "published": published})
+
+
+def as_feed_item(created):
+    # A record for a freshly created post, like a /posts list entry, when the
+    # reply carries enough to render it
+    if not created or "owner" not in created:
+        return None
+    return to_record(created)
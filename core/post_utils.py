@@ -1,31 +1,34 @@
 # core/post_utils.py
 
+import time
 from datetime import datetime, timezone
-from core.api import post
+from functools import lru_cache
 
 
-def time_ago(timestamp_str: str) -> str:
-    now = datetime.now(timezone.utc)
-    dt = None
-
-    # Remove trailing 'Z' if present
-    ts = timestamp_str.rstrip("Z")
-
-    # Try multiple formats
-    for fmt in ("%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S"):
-        try:
-            dt = datetime.strptime(ts, fmt)
-            dt = dt.replace(tzinfo=timezone.utc)
-            break
-        except ValueError:
-            continue
-
-    if dt is None:
-        return timestamp_str  # fallback if parsing fails
-
-    diff = now - dt
-    seconds = int(diff.total_seconds())
-
+@lru_cache(maxsize=8192)
+def parse_timestamp(timestamp_str):
+    # Epoch seconds for a backend timestamp, or None if it can't be parsed.
+    # Memoized: the same created_at strings come back on every fetch, and
+    # records parse them once at ingest (core.records).
+    try:
+        dt = datetime.fromisoformat(timestamp_str)
+    except ValueError:
+        dt = None
+        ts = timestamp_str.rstrip("Z")
+        for fmt in ("%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S"):
+            try:
+                dt = datetime.strptime(ts, fmt)
+                break
+            except ValueError:
+                continue
+        if dt is None:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def relative_label(seconds):
     if seconds < 60:
         return f"{seconds} second{'s' if seconds != 1 else ''} ago"
     minutes = seconds // 60
@@ -41,10 +44,32 @@ def time_ago(timestamp_str: str) -> str:
     return f"{years} year{'s' if years != 1 else ''} ago"
 
 
+def time_ago_batch(records, now=None):
+    # {post id: label} for PostRecords, all measured from a single "now"
+    now = time.time() if now is None else now
+    labels = {}
+    for record in records:
+        ts = record.created_ts
+        labels[record.id] = (
+            record.created_at if ts is None else relative_label(int(now - ts))
+        )
+    return labels
+
+
+def time_ago(timestamp_str: str) -> str:
+    ts = parse_timestamp(timestamp_str)
+    if ts is None:
+        return timestamp_str  # fallback if parsing fails
+    return relative_label(int(time.time() - ts))
+
+
 # -------------------- POST HANDLERS --------------------
 def handle_create_post(title, content, published):
     if not title or not content:
         return "Title and content are required"
+    # Imported here so the time helpers don't pull in the HTTP stack
+    from core.api import post
+
     try:
         post("/posts", {"title": title, "content": content, "published": published})
     except Exception as e:
@@ -0,0 +1,53 @@
+# core/prefetch.py
+
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+from core import metrics
+from core.api import fetch_json
+from core.auth import auth_header
+from core.config import PREFETCH_WAIT_TIMEOUT, PREFETCH_WORKERS
+
+# Shared by every session; the workers only do HTTP + JSON decoding and never
+# touch st.session_state, which is not available off the script thread.
+_executor = ThreadPoolExecutor(
+    max_workers=PREFETCH_WORKERS, thread_name_prefix="prefetch"
+)
+
+
+def _fetch(endpoint, headers):
+    response, data = fetch_json(endpoint, headers)
+    return data if response.ok else None
+
+
+def start(slot, endpoint):
+    # At most one prefetch per slot; starting another discards the previous
+    pending = st.session_state.get(slot)
+    if pending and pending["endpoint"] == endpoint:
+        return
+    discard(slot)
+    st.session_state[slot] = {
+        "endpoint": endpoint,
+        "future": _executor.submit(metrics.bind(_fetch), endpoint, auth_header()),
+    }
+
+
+def discard(slot):
+    pending = st.session_state.pop(slot, None)
+    if pending:
+        pending["future"].cancel()
+
+
+def take(slot, endpoint):
+    # The prefetched body for endpoint, or None if the caller must fetch it.
+    # A prefetch made for other filters or another offset is thrown away.
+    pending = st.session_state.pop(slot, None)
+    if not pending:
+        return None
+    if pending["endpoint"] != endpoint:
+        pending["future"].cancel()
+        return None
+    try:
+        return pending["future"].result(timeout=PREFETCH_WAIT_TIMEOUT)
+    except Exception:
+        return None
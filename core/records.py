@@ -0,0 +1,99 @@
+# core/records.py
+
+# Compact in-memory form of the posts a session holds. The backend sends
+# {"Post": {..., "owner": {...}}, "votes": n, "user_voted": b} per item; we
+# keep one slotted PostRecord per post instead, share Owner objects by id
+# across every session in the process, and intern titles/bodies so the same
+# text fetched by many sessions (or many times) is stored once.
+
+import sys
+import threading
+import weakref
+
+from core.post_utils import parse_timestamp
+
+_owners = weakref.WeakValueDictionary()
+_owners_lock = threading.Lock()
+
+
+class Owner:
+    __slots__ = ("id", "first_name", "last_name", "email", "__weakref__")
+
+
+def intern_owner(data):
+    with _owners_lock:
+        owner = _owners.get(data["id"])
+        if owner is None:
+            owner = Owner()
+            owner.id = data["id"]
+            _owners[owner.id] = owner
+        # Refresh in place: a renamed user shows up everywhere at once
+        owner.first_name = data.get("first_name", "")
+        owner.last_name = data.get("last_name", "")
+        owner.email = data.get("email", "")
+    return owner
+
+
+class PostRecord:
+    __slots__ = (
+        "id",
+        "title",
+        "content",
+        "published",
+        "owner_id",
+        "owner",
+        "created_at",
+        "created_ts",
+        "votes",
+        "user_voted",
+        "truncated",  # content is only the backend's summary (core.bodies)
+    )
+
+    def update(self, fields):
+        for name, value in fields.items():
+            if name in ("title", "content"):
+                value = sys.intern(value)
+            setattr(self, name, value)
+        if "content" in fields:
+            self.truncated = False
+
+    def snapshot(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def restore(self, snapshot):
+        for name, value in zip(self.__slots__, snapshot):
+            setattr(self, name, value)
+
+
+def _fill(record, post, votes, user_voted):
+    record.id = post["id"]
+    record.title = sys.intern(post["title"])
+    record.content = sys.intern(post["content"])
+    record.truncated = bool(post.get("content_truncated", False))
+    record.published = post["published"]
+    record.owner_id = post["owner_id"]
+    owner = post.get("owner")
+    record.owner = intern_owner(owner) if owner else None
+    record.created_at = post["created_at"]
+    record.created_ts = parse_timestamp(post["created_at"])
+    record.votes = votes
+    record.user_voted = user_voted
+    return record
+
+
+def to_record(item, known=None):
+    # Accepts a /posts list entry or a bare post (e.g. the POST /posts reply).
+    # With known ({id: PostRecord}) an existing record is refreshed in place,
+    # so a post seen twice in one session is still a single object.
+    post = item.get("Post", item)
+    record = known.get(post["id"]) if known else None
+    return _fill(
+        record or PostRecord(),
+        post,
+        item.get("votes", 0),
+        item.get("user_voted", False),
+    )
+
+
+def ingest(items, known=None):
+    return [to_record(item, known) for item in items]
@@ -0,0 +1,72 @@
+# core/response_cache.py
+
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+
+from core.config import RESPONSE_CACHE_MAX_ENTRIES
+
+
+def identity_of(headers):
+    # Never keep raw bearer tokens around as dictionary keys
+    auth = headers.get("Authorization", "")
+    return hashlib.sha256(auth.encode()).hexdigest()[:16]
+
+
+# Process-wide LRU of GET bodies plus their ETag/Last-Modified validators.
+# Entries are keyed by (endpoint, identity) so one user's response is never
+# served to another. Bodies are copied on the way out because the pages
+# mutate the lists they get back.
+class ResponseCache:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "revalidations": 0}
+
+    def validators(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return {}
+            self._entries.move_to_end(key)
+            self.stats["revalidations"] += 1
+        headers = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def hit(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self.stats["hits"] += 1
+        return copy.deepcopy(entry["data"])
+
+    def store(self, key, response, data):
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        with self._lock:
+            self.stats["misses"] += 1
+            if not response.ok or not (etag or last_modified):
+                self._entries.pop(key, None)
+                return
+            self._entries[key] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "data": copy.deepcopy(data),
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES)
@@ -0,0 +1,98 @@
+# core/search.py
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import streamlit as st
+from core import metrics
+from core.api import fetch_json, handle_fetched
+from core.auth import auth_header
+from core.feed_cache import feed_cache
+from core.config import (
+    SEARCH_CACHE_SIZE,
+    SEARCH_CACHE_TTL,
+    SEARCH_DEBOUNCE,
+    SEARCH_WORKERS,
+)
+
+_executor = ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix="search")
+_recent_lock = threading.Lock()
+
+
+def _state():
+    # Shared with the worker threads by reference; they only read "seq"
+    if "_search" not in st.session_state:
+        st.session_state["_search"] = {"seq": 0, "recent": OrderedDict()}
+    return st.session_state["_search"]
+
+
+def _remember(state, endpoint, data, generation):
+    # generation: feed_cache.generation from before the request was sent
+    recent = state["recent"]
+    with _recent_lock:
+        recent[endpoint] = (time.monotonic() + SEARCH_CACHE_TTL, generation, data)
+        recent.move_to_end(endpoint)
+        while len(recent) > SEARCH_CACHE_SIZE:
+            recent.popitem(last=False)
+
+
+def _run(state, seq, endpoint, headers):
+    time.sleep(SEARCH_DEBOUNCE)
+    if state["seq"] != seq:
+        return None  # superseded while debouncing, never sent
+    generation = feed_cache.generation
+    response, data = fetch_json(endpoint, headers)
+    if response.ok:
+        # Still worth keeping even if a newer query won meanwhile
+        _remember(state, endpoint, data, generation)
+    return response, data
+
+
+def recent(endpoint):
+    state = _state()
+    with _recent_lock:
+        entry = state["recent"].get(endpoint)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        # Any write since (a vote, an edit...) makes the replay stale, and
+        # replaying it would overwrite the live records with old values
+        if entry[1] != feed_cache.generation:
+            del state["recent"][endpoint]
+            return None
+        state["recent"].move_to_end(endpoint)
+    return list(entry[2])
+
+
+def run(endpoint):
+    # First page for a search endpoint ([] for no matches), or None if it
+    # failed (already reported, like get()) or went stale. A recently used
+    # query is answered from the per-session LRU, unless anything was
+    # written since.
+    cached = recent(endpoint)
+    if cached is not None:
+        return cached
+
+    state = _state()
+    state["seq"] += 1
+    seq = state["seq"]
+    future = _executor.submit(metrics.bind(_run), state, seq, endpoint, auth_header())
+
+    # Reading st.session_state while waiting gives Streamlit a chance to
+    # abort this run as soon as a newer query reruns the script, without
+    # sending anything to the browser
+    status = st.empty()
+    status.caption("🔎 Searching…")
+    while True:
+        try:
+            result = future.result(timeout=0.05)
+            break
+        except TimeoutError:
+            _state()
+    status.empty()
+
+    if result is None or state["seq"] != seq:
+        return None  # a newer query owns the feed now
+    data = handle_fetched(*result)
+    return None if data is None else list(data)
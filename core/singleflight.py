@@ -0,0 +1,45 @@
+# core/singleflight.py
+
+import threading
+from concurrent.futures import Future
+
+
+# Collapses concurrent calls for the same key into one. The first caller
+# (the leader) runs fn; everyone arriving while it is in flight waits on the
+# leader's result instead of repeating the work. The leader's exception is
+# raised in every waiter, and a waiter gives up after timeout seconds with
+# concurrent.futures.TimeoutError.
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.stats = {"issued": 0, "coalesced": 0}
+
+    def do(self, key, fn, timeout=None):
+        # Returns (result, shared); shared results are the leader's objects,
+        # so callers that hand them out must copy them first
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+                self.stats["issued"] += 1
+            else:
+                self.stats["coalesced"] += 1
+        if not leader:
+            return call.result(timeout=timeout), True
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            self._forget(key)
+            call.set_exception(exc)
+            raise
+        self._forget(key)
+        call.set_result(result)
+        return result, False
+
+    def _forget(self, key):
+        # Done before resolving, so later callers start a fresh request
+        with self._lock:
+            self._calls.pop(key, None)
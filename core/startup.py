@@ -0,0 +1,109 @@
+# core/startup.py
+#
+# Server-start warm-up, so the first session after a deploy doesn't pay for
+# imports, the first backend connection or cold process caches:
+#
+#   python -m core.startup [streamlit run options]   warm up, then serve app.py
+#   python -m core.startup --report                  warm up, print timings only
+#
+# Streamlit runs the page scripts inside this process, so everything imported
+# and built here is already in place when the first session arrives.
+
+import importlib
+import sys
+import time
+from pathlib import Path
+
+APP = Path(__file__).resolve().parent.parent / "app.py"
+
+# What the pages import, heaviest first
+MODULES = (
+    "streamlit",
+    "requests",
+    "core.config",
+    "core.api",
+    "core.users",
+    "core.records",
+    "core.post_index",
+    "core.post_store",
+    "core.pager",
+    "core.delta",
+    "core.bodies",
+    "core.vote_queue",
+    "core.prefetch",
+    "core.search",
+    "core.validators",
+    "ui.cards",
+    "ui.feed",
+    "ui.sidebar",
+    "ui.styles",
+)
+
+# The sheet combinations the pages inject (see ui.styles)
+STYLESHEETS = (("posts", "feed"), ("posts", "my_posts"), ("profile",))
+
+
+def _timed(timings, step, fn):
+    start = time.perf_counter()
+    try:
+        fn()
+    except Exception as exc:  # warm-up must never keep the server from starting
+        step = f"{step} (failed: {exc.__class__.__name__})"
+    timings[step] = time.perf_counter() - start
+
+
+def _open_connection():
+    # One round trip puts a keep-alive connection into the shared pool
+    from core.client import request
+    from core.config import HTTP_CONNECT_TIMEOUT
+
+    request("HEAD", "/", timeout=(HTTP_CONNECT_TIMEOUT, 2)).close()
+
+
+def _fill_caches():
+    from ui.styles import stylesheet
+
+    for names in STYLESHEETS:
+        stylesheet("sidebar", *names)
+
+
+def warm():
+    # {step: seconds}, in the order the steps ran
+    timings = {}
+    for name in MODULES:
+        _timed(timings, f"import {name}", lambda: importlib.import_module(name))
+    _timed(timings, "http pool", _open_connection)
+    _timed(timings, "caches", _fill_caches)
+
+    from core import metrics
+    from core.config import METRICS_ENABLED
+
+    if METRICS_ENABLED:
+        for step, seconds in timings.items():
+            metrics.record("startup_seconds", {"step": step}, seconds)
+    return timings
+
+
+def report(timings):
+    imports = sum(s for step, s in timings.items() if step.startswith("import "))
+    lines = [f"startup: {1000 * sum(timings.values()):.1f} ms"]
+    lines.append(f"  imports   {1000 * imports:8.1f} ms")
+    for step, seconds in sorted(timings.items(), key=lambda item: -item[1]):
+        lines.append(f"    {step:<40}{1000 * seconds:8.1f} ms")
+    return "\n".join(lines)
+
+
+def main(argv):
+    timings = warm()
+    print(report(timings), file=sys.stderr)
+    if "--report" in argv:
+        return
+
+    from streamlit.web import cli
+
+    sys.argv = ["streamlit", "run", str(APP), *argv]
+    cli.main()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
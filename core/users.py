@@ -0,0 +1,84 @@
+# core/users.py
+
+import time
+
+import streamlit as st
+from core.api import get, get_many
+from core.auth import PROFILE_CACHE_KEY, token_claims
+from core.config import PROFILE_CACHE_TTL, PROFILE_ENDPOINT
+
+
+def _cached_user(token):
+    # Cached per session and keyed by token, so a re-login never sees the
+    # previous user's profile. core.api.patch clears it on /users/{id} writes.
+    cached = st.session_state.get(PROFILE_CACHE_KEY)
+    if cached and cached["token"] == token and cached["expires_at"] > time.monotonic():
+        return cached["user"]
+    return None
+
+
+def _cache_user(token, user):
+    if user is not None:
+        st.session_state[PROFILE_CACHE_KEY] = {
+            "token": token,
+            "user": user,
+            "expires_at": time.monotonic() + PROFILE_CACHE_TTL,
+        }
+
+
+# Profile fields and the token claims that may carry them
+_CLAIM_FIELDS = {
+    "id": ("user_id", "id", "sub"),
+    "email": ("email",),
+    "first_name": ("first_name", "given_name"),
+    "last_name": ("last_name", "family_name"),
+}
+
+
+def user_from_claims(claims):
+    user = {}
+    for field, names in _CLAIM_FIELDS.items():
+        for name in names:
+            if claims.get(name) not in (None, ""):
+                user[field] = claims[name]
+                break
+    if "id" not in user:
+        return None
+    user_id = str(user["id"])
+    if not user_id.isdigit():
+        return None  # "sub" is an email or uuid, not our user id
+    user["id"] = int(user_id)
+    return user
+
+
+def _known_user(token, needs):
+    # From the profile cache, or straight from the token when it carries
+    # every field the caller needs (needs=None: the full profile)
+    user = _cached_user(token)
+    if user is not None or needs is None:
+        return user
+    user = user_from_claims(token_claims(token))
+    if user is not None and all(field in user for field in needs):
+        return user
+    return None
+
+
+def get_current_user(needs=None):
+    token = st.session_state.get("access_token")
+    user = _known_user(token, needs)
+    if user is None:
+        user = get(PROFILE_ENDPOINT)
+        _cache_user(token, user)
+    return user
+
+
+def get_current_user_with(*endpoints, needs=None):
+    # The profile plus a page's other initial GETs, fetched concurrently when
+    # the profile is not known yet. Returns (user, [results...]).
+    token = st.session_state.get("access_token")
+    user = _known_user(token, needs)
+    if user is not None:
+        return user, get_many(*endpoints)
+    user, *results = get_many(PROFILE_ENDPOINT, *endpoints)
+    _cache_user(token, user)
+    return user, results
@@ -0,0 +1,163 @@
+# core/vote_queue.py
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import streamlit as st
+from core.api import send_json
+from core.auth import auth_header
+from core.config import (
+    VOTE_ENDPOINT,
+    VOTE_FLUSH_DELAY,
+    VOTE_RETRIES,
+    VOTE_RETRY_BACKOFF,
+    VOTE_WORKERS,
+)
+
+# Shared by every session, which bounds how many vote writes the process has
+# in flight at once. Workers only do HTTP and never touch st.session_state.
+_executor = ThreadPoolExecutor(max_workers=VOTE_WORKERS, thread_name_prefix="votes")
+
+STATE_KEY = "_vote_queue"
+
+
+# Write-behind votes for one session. toggle() only records the wanted state;
+# a flush VOTE_FLUSH_DELAY later sends each post's net change once, so
+# vote/unvote/vote turns into a single request and vote/unvote into none.
+class VoteQueue:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._server = {}  # post_id -> voted, as the backend last had it
+        self._wanted = {}  # post_id -> voted, as the user last left it
+        self._in_flight = set()
+        self._failures = []
+        self._timer = None
+        self.stats = {"sent": 0, "coalesced": 0, "retried": 0, "failed": 0}
+
+    def toggle(self, post_id, voted, headers):
+        # voted: the state the user just switched to
+        with self._lock:
+            self._server.setdefault(post_id, not voted)
+            self._wanted[post_id] = voted
+            self._schedule(headers)
+
+    def _schedule(self, headers):
+        if self._timer is None:
+            self._timer = threading.Timer(VOTE_FLUSH_DELAY, self._flush, (headers,))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush(self, headers):
+        with self._lock:
+            self._timer = None
+            batch = []
+            for post_id, voted in list(self._wanted.items()):
+                if post_id in self._in_flight:
+                    continue  # resent once the current request settles
+                if voted == self._server[post_id]:
+                    # Toggled back to where the backend already is
+                    del self._wanted[post_id], self._server[post_id]
+                    self.stats["coalesced"] += 1
+                    continue
+                self._in_flight.add(post_id)
+                batch.append((post_id, voted))
+        for post_id, voted in batch:
+            _executor.submit(self._send, post_id, voted, headers)
+
+    def _send(self, post_id, voted, headers):
+        payload = {"post_id": post_id, "dir": 1 if voted else 0}
+        detail = None
+        for attempt in range(VOTE_RETRIES + 1):
+            if attempt:
+                with self._lock:
+                    self.stats["retried"] += 1
+                time.sleep(VOTE_RETRY_BACKOFF * 2 ** (attempt - 1))
+            try:
+                response = send_json(VOTE_ENDPOINT, payload, headers)
+            except requests.RequestException:
+                detail = "Unable to connect to server"
+                continue
+            if response.ok:
+                detail = None
+                break
+            detail = _detail(response)
+            # Only server-side trouble is worth another try
+            if response.status_code < 500 and response.status_code != 429:
+                break
+
+        with self._lock:
+            self._in_flight.discard(post_id)
+            self.stats["sent" if detail is None else "failed"] += 1
+            if detail is None:
+                self._server[post_id] = voted
+            elif self._wanted.get(post_id) == voted:
+                # The user still wants what failed: undo it in the session
+                self._failures.append((post_id, voted, detail))
+                del self._wanted[post_id], self._server[post_id]
+            if post_id in self._wanted:
+                if self._wanted[post_id] == self._server[post_id]:
+                    del self._wanted[post_id], self._server[post_id]
+                else:
+                    self._schedule(headers)  # changed again while in flight
+
+    def pending(self, post_id):
+        # The state a toggle is waiting to send, or None
+        with self._lock:
+            return self._wanted.get(post_id)
+
+    def busy(self):
+        with self._lock:
+            return bool(self._wanted or self._in_flight)
+
+    def has_failures(self):
+        with self._lock:
+            return bool(self._failures)
+
+    def take_failures(self):
+        with self._lock:
+            failures, self._failures = self._failures, []
+        return failures
+
+
+def _detail(response):
+    try:
+        return response.json().get("detail", "Request failed")
+    except Exception:
+        return "Request failed"
+
+
+def current():
+    if STATE_KEY not in st.session_state:
+        st.session_state[STATE_KEY] = VoteQueue()
+    return st.session_state[STATE_KEY]
+
+
+def toggle(record):
+    # Flips the vote on a PostRecord right away and queues the write
+    record.user_voted = not record.user_voted
+    record.votes += 1 if record.user_voted else -1
+    current().toggle(record.id, record.user_voted, auth_header())
+
+
+def apply_pending(records):
+    # Freshly fetched records may predate a queued vote; show the vote anyway
+    queue = current()
+    for record in records:
+        voted = queue.pending(record.id)
+        if voted is not None and voted != record.user_voted:
+            record.user_voted = voted
+            record.votes += 1 if voted else -1
+
+
+def revert_failures(by_id):
+    # Rolls back votes the backend refused; returns [(record, detail)]
+    reverted = []
+    for post_id, voted, detail in current().take_failures():
+        record = by_id.get(post_id)
+        if record is not None and record.user_voted == voted:
+            record.user_voted = not voted
+            record.votes += -1 if voted else 1
+            reverted.append((record, detail))
+    return reverted
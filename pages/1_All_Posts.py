@@ -1,53 +1,68 @@
+import time
+
 import streamlit as st
 from core.auth import require_auth
-from core.api import get, post, patch, delete
+from core import metrics, prefetch, search, vote_queue
+from core.api import deferred_errors, get
+from core.config import (
+    FEED_INDEX_TTL,
+    FEED_SYNC_INTERVAL,
+    FEED_SYNC_MAX_PAGES,
+    FEED_SYNC_PAGE_SIZE,
+    SUMMARY_LENGTH,
+    VOTE_POLL_INTERVAL,
+)
+from core.bodies import full_body
+from core.delta import fetch_newer, newest
+from core.post_index import PostIndex
+from core.post_store import (
+    as_feed_item,
+    create_post,
+    delete_post,
+    update_post,
+)
+from core.users import get_current_user, get_current_user_with
+from ui.cards import card_body, card_header
+from ui.feed import render_window, reset_window, show_item, window_bounds
 from ui.sidebar import render_sidebar
-from core.post_utils import time_ago
+from ui.styles import inject
+from core.post_utils import time_ago_batch
+from core.pager import cursor_after
+from core.records import ingest
 
 # 1. -------------------- PAGE CONFIG & DYNAMIC THEME CSS --------------------
 st.set_page_config(page_title="Modern Feed", layout="centered")
 
-st.markdown(
-    """
-    <style>
-    div[data-testid="stVBCard"] {
-        border-radius: 16px;
-        border: 1px solid rgba(128, 128, 128, 0.2);
-        padding: 24px;
-        margin-bottom: 20px;
-        background-color: rgba(128, 128, 128, 0.03);
-        transition: transform 0.2s ease;
-    }
-    div[data-testid="stVBCard"]:hover {
-        border-color: #ff4b4b;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-    }
-    .post-meta { color: var(--text-color); opacity: 0.6; font-size: 0.85rem; margin-bottom: 8px; }
-    .post-title { font-size: 1.5rem; font-weight: 800; color: var(--text-color); margin-bottom: 12px; letter-spacing: -0.02em; line-height: 1.2; }
-    .draft-badge {
-        display: inline-block; padding: 2px 10px; border-radius: 20px;
-        background-color: rgba(255, 165, 0, 0.2); color: #ffa500;
-        font-size: 0.75rem; font-weight: 700; text-transform: uppercase; margin-bottom: 10px;
-    }
-    </style>
-""",
-    unsafe_allow_html=True,
-)
+inject("posts", "feed")
 
 # 2. -------------------- AUTH & STATE --------------------
-require_auth()
-current_user = get("/users/profile/me")
-current_user_id = current_user["id"]
+with metrics.phase("feed", "auth"):
+    require_auth()
+
+BATCH_SIZE = 20
+PREFETCH_SLOT = "feed_prefetch"
 
 if "posts_loaded" not in st.session_state:
     st.session_state.posts_loaded = []
 if "post_skip" not in st.session_state:
     st.session_state.post_skip = 0
+if "feed_exhausted" not in st.session_state:
+    st.session_state.feed_exhausted = False
+if "feed_index" not in st.session_state:
+    st.session_state.feed_index = PostIndex()
+if "feed_synced_at" not in st.session_state:
+    st.session_state.feed_synced_at = time.monotonic()
 
 
 def reset_feed():
     st.session_state.posts_loaded = []
     st.session_state.post_skip = 0
+    st.session_state.feed_exhausted = False
+    st.session_state.pop("feed_last", None)
+    st.session_state.feed_synced_at = time.monotonic()
+    st.session_state.pop("feed_new", None)
+    reset_window("feed")
+    prefetch.discard(PREFETCH_SLOT)
 
 
 # 3. -------------------- LOGIC HELPERS --------------------
@@ -55,10 +70,28 @@ def handle_create_post(title, content, published):
     if not title or not content:
         return "Title and content are required"
     try:
-        post("/posts", {"title": title, "content": content, "published": published})
-        return None
+        created = create_post(title, content, published)
     except Exception as e:
         return f"Error: {str(e)}"
+    if created is None:
+        return "Failed to create post"
+
+    # A new post lands at the top of an unfiltered "Newest" feed, so it can be
+    # placed locally; any other view has to be refetched to stay correct.
+    item = as_feed_item(created)
+    unfiltered = not st.session_state.get("search_query") and not st.session_state.get(
+        "date_range"
+    )
+    if item:
+        st.session_state.feed_index.add([item])
+    else:
+        st.session_state.feed_index.invalidate()
+    if item and unfiltered and st.session_state.get("sort_option") == "Newest":
+        st.session_state.posts_loaded.insert(0, item)
+        st.session_state.post_skip += 1
+    else:
+        reset_feed()
+    return None
 
 
 # 4. -------------------- DIALOGS --------------------
@@ -75,7 +108,6 @@ def create_post_dialog():
                 st.error(error)
             else:
                 st.toast("Post created! 🎉", icon="✅")
-                reset_feed()
                 st.rerun()
         if col2.form_submit_button("Cancel"):
             st.rerun()
@@ -83,56 +115,64 @@ def create_post_dialog():
 
 @st.dialog("✏️ Update Post")
 def update_post_dialog(post_data):
+    # Editing a summary would save it over the whole post
+    content = full_body(post_data)
+    if content is None:
+        return
     with st.form("update_post_form"):
         u_t = st.text_input(
-            "Title", post_data["title"], key=f"upd_t_{post_data['id']}"
+            "Title", post_data.title, key=f"upd_t_{post_data.id}"
         ).strip()
-        u_c = st.text_area(
-            "Content", post_data["content"], key=f"upd_c_{post_data['id']}"
-        ).strip()
-        u_p = st.checkbox(
-            "Published", post_data["published"], key=f"upd_p_{post_data['id']}"
-        )
+        u_c = st.text_area("Content", content, key=f"upd_c_{post_data.id}").strip()
+        u_p = st.checkbox("Published", post_data.published, key=f"upd_p_{post_data.id}")
         if st.form_submit_button("💾 Save", type="primary"):
             if not u_t or not u_c:
                 st.error("Title and Content cannot be empty!")
             else:
-                patch(
-                    f"/posts/{post_data['id']}",
+                if update_post(
+                    st.session_state.posts_loaded,
+                    post_data.id,
                     {"title": u_t, "content": u_c, "published": u_p},
-                )
-                st.toast("Post updated ✅")
-                reset_feed()
-                st.rerun()
+                ):
+                    st.session_state.feed_index.refresh(post_data.id)
+                    st.toast("Post updated ✅")
+                    st.rerun()
 
 
 @st.dialog("🗑️ Confirm Delete")
 def confirm_delete(post_id):
     st.warning("Delete this post permanently?")
     if st.button("Delete Forever", type="primary", use_container_width=True):
-        delete(f"/posts/{post_id}")
-        st.toast("Post deleted 🗑️")
-        reset_feed()
-        st.rerun()
+        if delete_post(st.session_state.posts_loaded, post_id):
+            # Everything after the deleted post moved up by one on the server
+            st.session_state.post_skip = max(st.session_state.post_skip - 1, 0)
+            st.session_state.feed_index.remove(post_id)
+            st.toast("Post deleted 🗑️")
+            st.rerun()
+        else:
+            st.error("Failed to delete post")
 
 
 # 5. -------------------- SIDEBAR --------------------
+# Fragment: validation errors only rerun the form, a new post reruns the feed
+@st.fragment
+def quick_post_form():
+    with st.form("sidebar_create_form", clear_on_submit=True):
+        s_title = st.text_input("Title", key="sidebar_title")
+        s_content = st.text_area("Content", key="sidebar_content")
+        s_published = st.checkbox("Publish now?", value=True, key="sidebar_create_pub")
+        if st.form_submit_button("Post"):
+            error = handle_create_post(s_title, s_content, s_published)
+            if not error:
+                st.toast("Posted!")
+                st.rerun()
+            else:
+                st.error(error)
+
+
 with st.sidebar:
     with st.expander("➕ Quick Post", expanded=False):
-        with st.form("sidebar_create_form", clear_on_submit=True):
-            s_title = st.text_input("Title", key="sidebar_title")
-            s_content = st.text_area("Content", key="sidebar_content")
-            s_published = st.checkbox(
-                "Publish now?", value=True, key="sidebar_create_pub"
-            )
-            if st.form_submit_button("Post"):
-                error = handle_create_post(s_title, s_content, s_published)
-                if not error:
-                    st.toast("Posted!")
-                    reset_feed()
-                    st.rerun()
-                else:
-                    st.error(error)
+        quick_post_form()
     st.divider()
     render_sidebar()
 
@@ -178,19 +218,28 @@ if (
     st.session_state.sort_option = sort_c
     st.session_state.date_range = date_range
     reset_feed()
+    # Once the whole feed is held locally, filters never need the backend
+    if st.session_state.feed_index.is_complete():
+        st.session_state.posts_loaded = st.session_state.feed_index.query(
+            search_q, sort_c, date_range
+        )
+        st.session_state.post_skip = len(st.session_state.posts_loaded)
+        st.session_state.feed_exhausted = True
     st.rerun()
 
 
 # 7. -------------------- API FETCH --------------------
-def fetch_posts_batch():
-    skip = st.session_state.post_skip
+# after: the last list entry received, to continue from by cursor when the
+# backend supports it (core.pager.cursor_after); skip is the fallback
+def feed_endpoint(skip, limit=BATCH_SIZE, since=None, after=None):
     search = st.session_state.get("search_query", "")
     sort_opt = st.session_state.get("sort_option", "Newest")
     d_range = st.session_state.get("date_range", [])
 
     sort_map = {"Newest": "newest", "Oldest": "oldest", "Popularity": "popularity"}
 
-    query_params = f"limit=20&skip={skip}&sort={sort_map[sort_opt]}"
+    page = cursor_after(after, sort_map[sort_opt]) or f"skip={skip}"
+    query_params = f"limit={limit}&{page}&sort={sort_map[sort_opt]}"
 
     if search:
         query_params += f"&search={search}"
@@ -200,97 +249,284 @@ def fetch_posts_batch():
         query_params += f"&start_date={d_range[0].isoformat()}"
         query_params += f"&end_date={d_range[1].isoformat()}"
 
-    new_posts = get(f"/posts?{query_params}")
-    st.session_state.posts_loaded.extend(new_posts)
+    if since:
+        query_params += f"&since={since}"
+
+    if SUMMARY_LENGTH:
+        query_params += f"&summary={SUMMARY_LENGTH}"
+
+    return f"/posts?{query_params}"
+
+
+def next_endpoint():
+    return feed_endpoint(
+        st.session_state.post_skip, after=st.session_state.get("feed_last")
+    )
+
+
+def add_posts_batch(new_posts):
+    # Posts already known to this session are refreshed, not duplicated, and
+    # one that is already listed (offsets shifted under us) isn't listed again
+    loaded = {r.id for r in st.session_state.posts_loaded}
+    records = ingest(new_posts, st.session_state.feed_index.by_id)
+    vote_queue.apply_pending(records)
+    st.session_state.posts_loaded.extend(r for r in records if r.id not in loaded)
     st.session_state.post_skip += len(new_posts)
+    st.session_state.feed_index.add(records)
+    if new_posts:
+        st.session_state.feed_last = new_posts[-1]
+
+    if len(new_posts) < BATCH_SIZE:
+        st.session_state.feed_exhausted = True
+        # An unfiltered feed read to the end holds every visible post
+        if not st.session_state.get("search_query") and not st.session_state.get(
+            "date_range"
+        ):
+            st.session_state.feed_index.mark_complete(FEED_INDEX_TTL)
+    else:
+        # Read ahead while the user is looking at this batch
+        prefetch.start(PREFETCH_SLOT, next_endpoint())
+
+
+def fetch_posts_batch():
+    endpoint = next_endpoint()
+    # "Load More" is a local append when the prefetch for this exact
+    # query/offset has already landed (or is about to)
+    new_posts = prefetch.take(PREFETCH_SLOT, endpoint)
+    if new_posts is None:
+        new_posts = get(endpoint) or []
+    add_posts_batch(new_posts)
+
+
+# Cold load: profile and first batch go out together. A new search goes
+# through the debounced pipeline so an older, slower query can't win.
+with metrics.phase("feed", "fetch"):
+    # Only the user id is needed here, which the token usually carries
+    if st.session_state.posts_loaded or st.session_state.feed_exhausted:
+        current_user = get_current_user(needs=("id",))
+    elif st.session_state.get("search_query"):
+        current_user = get_current_user(needs=("id",))
+        first_batch = search.run(feed_endpoint(0))
+        if first_batch is not None:
+            add_posts_batch(first_batch)
+    else:
+        current_user, (first_batch,) = get_current_user_with(
+            feed_endpoint(0), needs=("id",)
+        )
+        add_posts_batch(first_batch or [])
+current_user_id = current_user["id"]
+
+
+# 7b. -------------------- NEW POSTS --------------------
+# Every FEED_SYNC_INTERVAL the Newest feed asks only for posts newer than
+# the newest one held (core.delta) and offers them above the feed; taking
+# them is a local insert at the top instead of a reload from skip=0.
+def show_new_posts():
+    items, more = st.session_state.pop("feed_new", ([], False))
+    if more:
+        # Too many to stitch onto what's loaded without a gap
+        reset_feed()
+        return
+    known = st.session_state.feed_index.by_id
+    fresh = [item for item in items if item.get("Post", item)["id"] not in known]
+    records = ingest(fresh)
+    vote_queue.apply_pending(records)
+    st.session_state.posts_loaded[:0] = records
+    # Offsets of everything below moved down by the new posts
+    st.session_state.post_skip += len(records)
+    st.session_state.feed_index.add(records)
+    prefetch.discard(PREFETCH_SLOT)
+    show_item("feed", 0)
+
+
+@st.fragment(run_every=FEED_SYNC_INTERVAL or None)
+def new_posts_bar():
+    if (
+        not FEED_SYNC_INTERVAL
+        or st.session_state.get("sort_option") != "Newest"
+        or not st.session_state.posts_loaded
+    ):
+        return
+    if time.monotonic() - st.session_state.feed_synced_at >= FEED_SYNC_INTERVAL:
+        st.session_state.feed_synced_at = time.monotonic()
+        st.session_state.feed_new = fetch_newer(
+            lambda skip, since: feed_endpoint(skip, FEED_SYNC_PAGE_SIZE, since),
+            newest(st.session_state.posts_loaded),
+            FEED_SYNC_PAGE_SIZE,
+            FEED_SYNC_MAX_PAGES,
+        )
+    items, more = st.session_state.get("feed_new", ([], False))
+    if items:
+        count = f"{len(items)}{'+' if more else ''}"
+        label = f"🆕 {count} new post{'' if count == '1' else 's'}"
+        if st.button(label, key="feed_new_posts", use_container_width=True):
+            show_new_posts()
+            st.rerun()
+
 
+new_posts_bar()
 
-if not st.session_state.posts_loaded:
-    fetch_posts_batch()
 
 # 8. -------------------- FEED DISPLAY LOOP --------------------
-display_posts = st.session_state.posts_loaded
-if show_drafts_only:
-    display_posts = [
-        i
-        for i in display_posts
-        if not i["Post"]["published"] and i["Post"]["owner_id"] == current_user_id
-    ]
-    if not display_posts:
-        st.info("No drafts found.")
+# Each card is a fragment and its buttons act through on_click callbacks, so
+# "Read more", vote and publish rerun one card instead of the whole page.
+# Dialogs (edit/delete) still trigger a full rerun when they close.
+def set_expanded(expand_key, expanded):
+    st.session_state[expand_key] = expanded
+
+
+# Callbacks can't draw during a fragment rerun, so toasts wait for the card
+# and so do request errors
+def publish_post(p_id):
+    with deferred_errors() as errors:
+        ok = update_post(st.session_state.posts_loaded, p_id, {"published": True})
+    if ok:
+        st.session_state.feed_index.refresh(p_id)
+        st.session_state[f"toast_{p_id}"] = "Post live! 🚀"
+    elif errors:
+        st.session_state[f"error_{p_id}"] = errors[-1]
+
+
+# The vote shows at once; core.vote_queue sends it after a short pause, so a
+# quick vote/unvote costs no request at all
+def toggle_vote(p_id):
+    record = st.session_state.feed_index.by_id.get(p_id)
+    if record is None:
+        return
+    vote_queue.toggle(record)
+    st.session_state.feed_index.refresh(p_id)
+    st.session_state[f"toast_{p_id}"] = "Vote updated ✅"
+
+
+# Votes the backend refused (after retries) are rolled back on the next full
+# run. A card whose vote is still queued mounts the poller below, which
+# forces that run once the queue has settled (or something failed); the run
+# draws the card without it, so nothing polls while no vote is outstanding.
+def revert_failed_votes():
+    for record, detail in vote_queue.revert_failures(st.session_state.feed_index.by_id):
+        st.session_state.feed_index.refresh(record.id)
+        st.toast(f"Vote on “{record.title}” failed: {detail}", icon="⚠️")
+
+
+@st.fragment(run_every=VOTE_POLL_INTERVAL or None)
+def watch_votes():
+    queue = vote_queue.current()
+    if not queue.busy() or queue.has_failures():
+        st.rerun()
 
-for idx, item in enumerate(display_posts):
-    p_data, p_id = item["Post"], item["Post"]["id"]
-    is_owner = p_data["owner_id"] == current_user_id
+
+revert_failed_votes()
+
+
+@st.fragment
+def render_post_card(idx, post):
+    p_id = post.id
+    is_owner = post.owner_id == current_user_id
+    toast = st.session_state.pop(f"toast_{p_id}", None)
+    if toast:
+        st.toast(toast)
+    if show_drafts_only and post.published:
+        return  # published from the drafts view
     expand_key = f"exp_{p_id}_{idx}"
     if expand_key not in st.session_state:
         st.session_state[expand_key] = False
 
     with st.container(border=True):
-        m1, m2 = st.columns([4, 1])
-        m1.markdown(
-            f"<div class='post-meta'>@{p_data['owner']['first_name']} • {time_ago(p_data['created_at'])}</div>",
+        error = st.session_state.pop(f"error_{p_id}", None)
+        if error:
+            st.error(error)
+        long = post.truncated or len(post.content) > 250
+        collapsed = long and not st.session_state[expand_key]
+        # Summaries only: the rest of the body is fetched on "Read more"
+        body = None if collapsed else full_body(post)
+        st.markdown(
+            card_header(
+                post,
+                f"@{post.owner.first_name} • {time_labels.get(p_id, '')}",
+                votes=f"<b>{post.votes}</b> 👍" if post.votes > 0 else "",
+                draft=is_owner and not post.published,
+            ),
             unsafe_allow_html=True,
         )
-        if item["votes"] > 0:
-            m2.markdown(
-                f"<div style='text-align:right;'><b>{item['votes']}</b> 👍</div>",
-                unsafe_allow_html=True,
-            )
-
-        if is_owner and not p_data["published"]:
-            st.markdown(
-                "<span class='draft-badge'>📝 Draft</span>", unsafe_allow_html=True
-            )
-
         st.markdown(
-            f"<div class='post-title'>{p_data['title']}</div>", unsafe_allow_html=True
+            card_body(
+                post, excerpt=250 if collapsed or body is None else None, body=body
+            )
         )
-
-        txt = p_data["content"]
-        if len(txt) > 250 and not st.session_state[expand_key]:
-            st.write(txt[:250] + "...")
-            if st.button("Read more ↓", key=f"r_{p_id}_{idx}", type="secondary"):
-                st.session_state[expand_key] = True
-                st.rerun()
-        else:
-            st.write(txt)
-            if len(txt) > 250 and st.button(
-                "Show less ↑", key=f"l_{p_id}_{idx}", type="secondary"
-            ):
-                st.session_state[expand_key] = False
-                st.rerun()
+        if collapsed:
+            st.button(
+                "Read more ↓",
+                key=f"r_{p_id}_{idx}",
+                type="secondary",
+                on_click=set_expanded,
+                args=(expand_key, True),
+            )
+        elif long:
+            st.button(
+                "Show less ↑",
+                key=f"l_{p_id}_{idx}",
+                type="secondary",
+                on_click=set_expanded,
+                args=(expand_key, False),
+            )
 
         b1, b2, b3 = st.columns([1.5, 1, 1])
-        if is_owner and not p_data["published"]:
-            if b1.button(
-                "🚀 Publish", key=f"pb_{p_id}", use_container_width=True, type="primary"
-            ):
-                patch(f"/posts/{p_id}", {"published": True})
-                st.toast("Post live! 🚀")
-                reset_feed()
-                st.rerun()
+        if is_owner and not post.published:
+            b1.button(
+                "🚀 Publish",
+                key=f"pb_{p_id}",
+                use_container_width=True,
+                type="primary",
+                on_click=publish_post,
+                args=(p_id,),
+            )
         else:
-            v_act = item["user_voted"]
+            v_act = post.user_voted
             v_lab = "👍 Vote" if not v_act else "👎 Unvote"
-            if b1.button(
+            b1.button(
                 v_lab,
                 key=f"v_{p_id}_{idx}",
                 use_container_width=True,
                 type="primary" if v_act else "secondary",
-            ):
-                post("/vote", {"post_id": p_id, "dir": 0 if v_act else 1})
-                st.toast("Vote updated ✅")
-                reset_feed()
-                st.rerun()
+                on_click=toggle_vote,
+                args=(p_id,),
+            )
+            if VOTE_POLL_INTERVAL and vote_queue.current().pending(p_id) is not None:
+                watch_votes()
 
         if is_owner:
             if b2.button("✏️ Edit", key=f"ed_{p_id}", use_container_width=True):
-                update_post_dialog(p_data)
+                update_post_dialog(post)
             if b3.button("🗑️", key=f"dl_{p_id}", use_container_width=True):
                 confirm_delete(p_id)
 
-if len(st.session_state.posts_loaded) >= 20:
+
+display_posts = st.session_state.posts_loaded
+if show_drafts_only:
+    if st.session_state.feed_index.is_complete():
+        display_posts = st.session_state.feed_index.query(
+            search_q, sort_c, date_range, drafts_of=current_user_id
+        )
+    else:
+        display_posts = [
+            i
+            for i in display_posts
+            if not i.published and i.owner_id == current_user_id
+        ]
+    if not display_posts:
+        st.info("No drafts found.")
+
+# Relative times for the visible window only, from one "now" per rerun
+start, end, _, _ = window_bounds(len(display_posts), "feed")
+with metrics.phase("feed", "time_labels"):
+    time_labels = time_ago_batch(display_posts[start:end])
+
+with metrics.phase("feed", "render"):
+    at_end = render_window(display_posts, render_post_card, key="feed")
+
+if at_end and not st.session_state.feed_exhausted:
     if st.button("Load More", use_container_width=True, key="load_more_footer"):
+        loaded = len(st.session_state.posts_loaded)
         fetch_posts_batch()
+        show_item("feed", loaded)
         st.rerun()
@@ -1,83 +1,96 @@
 import streamlit as st
+from core import metrics, prefetch
+from core.api import get
 from core.auth import require_auth
-from core.api import get, patch, delete
+from core.bodies import full_body
+from core.config import MY_POSTS_PAGE_SIZE, SUMMARY_LENGTH
+from core.pager import cursor_after
+from core.post_store import delete_post, update_post
+from core.users import get_current_user, get_current_user_with
+from ui.cards import card_body, card_header
+from ui.feed import render_window, show_item, window_bounds
 from ui.sidebar import render_sidebar
-from core.post_utils import time_ago
+from ui.styles import inject
+from core.post_utils import time_ago_batch
+from core.records import ingest
 
 # 1. -------------------- PAGE CONFIG & DYNAMIC THEME CSS --------------------
 st.set_page_config(page_title="My Posts", layout="centered")
 
-st.markdown(
-    """
-    <style>
-    div[data-testid="stVBCard"] {
-        border-radius: 16px;
-        border: 1px solid rgba(128, 128, 128, 0.2);
-        padding: 24px;
-        margin-bottom: 20px;
-        background-color: rgba(128, 128, 128, 0.03);
-    }
-    .post-meta { color: var(--text-color); opacity: 0.6; font-size: 0.85rem; margin-bottom: 8px; }
-    .post-title { font-size: 1.5rem; font-weight: 800; color: var(--text-color); margin-bottom: 12px; }
-    .draft-badge {
-        display: inline-block; padding: 2px 10px; border-radius: 20px;
-        background-color: rgba(255, 165, 0, 0.2); color: #ffa500;
-        font-size: 0.75rem; font-weight: 700; text-transform: uppercase; margin-bottom: 10px;
-    }
-    .stats-badge {
-        background: rgba(128, 128, 128, 0.1);
-        padding: 5px 12px;
-        border-radius: 10px;
-        font-size: 0.9rem;
-    }
-    </style>
-""",
-    unsafe_allow_html=True,
-)
+inject("posts", "my_posts")
 
 # 2. -------------------- AUTH & STATE --------------------
-require_auth()
-current_user = get("/users/profile/me")
+with metrics.phase("my_posts", "auth"):
+    require_auth()
 
 if "my_posts_loaded" not in st.session_state:
     st.session_state.my_posts_loaded = []
 if "my_post_skip" not in st.session_state:
     st.session_state.my_post_skip = 0
+if "my_posts_exhausted" not in st.session_state:
+    st.session_state.my_posts_exhausted = False
+# Kept in step with my_posts_loaded as pages arrive and posts change, so the
+# header never rescans the list
+if "my_post_counts" not in st.session_state:
+    st.session_state.my_post_counts = {"drafts": 0, "published": 0}
+
+PREFETCH_SLOT = "my_posts_prefetch"
 
 
 def reset_my_feed():
     st.session_state.my_posts_loaded = []
     st.session_state.my_post_skip = 0
+    st.session_state.my_posts_exhausted = False
+    st.session_state.my_post_counts = {"drafts": 0, "published": 0}
+    st.session_state.pop("my_posts_last", None)
+    prefetch.discard(PREFETCH_SLOT)
+
+
+def tally(records, sign=1):
+    counts = st.session_state.my_post_counts
+    for r in records:
+        counts["published" if r.published else "drafts"] += sign
 
 
 # 3. -------------------- DIALOGS (REUSED) --------------------
 @st.dialog("✏️ Update Post")
 def update_post_dialog(post_data):
+    # Editing a summary would save it over the whole post
+    content = full_body(post_data)
+    if content is None:
+        return
     with st.form("upd_form"):
-        u_t = st.text_input("Title", post_data["title"]).strip()
-        u_c = st.text_area("Content", post_data["content"]).strip()
-        u_p = st.checkbox("Published", post_data["published"])
+        u_t = st.text_input("Title", post_data.title).strip()
+        u_c = st.text_area("Content", content).strip()
+        u_p = st.checkbox("Published", post_data.published)
         if st.form_submit_button("Save Changes", type="primary"):
             if u_t and u_c:
-                patch(
-                    f"/posts/{post_data['id']}",
+                # Untally, apply (or roll back), tally again
+                tally([post_data], -1)
+                ok = update_post(
+                    st.session_state.my_posts_loaded,
+                    post_data.id,
                     {"title": u_t, "content": u_c, "published": u_p},
                 )
-                st.toast("Updated! ✅")
-                reset_my_feed()
-                st.rerun()
+                tally([post_data])
+                if ok:
+                    st.toast("Updated! ✅")
+                    st.rerun()
             else:
                 st.error("Fields cannot be empty")
 
 
 @st.dialog("🗑️ Confirm Delete")
-def confirm_delete(post_id):
+def confirm_delete(post_data):
     st.warning("Delete this post permanently?")
     if st.button("Delete Forever", type="primary", use_container_width=True):
-        delete(f"/posts/{post_id}")
-        st.toast("Deleted 🗑️")
-        reset_my_feed()
-        st.rerun()
+        if delete_post(st.session_state.my_posts_loaded, post_data.id):
+            tally([post_data], -1)
+            st.session_state.my_post_skip = max(st.session_state.my_post_skip - 1, 0)
+            st.toast("Deleted 🗑️")
+            st.rerun()
+        else:
+            st.error("Failed to delete post")
 
 
 # 4. -------------------- SIDEBAR --------------------
@@ -89,25 +102,64 @@ with st.sidebar:
 
 
 # 6. -------------------- API FETCH --------------------
-def fetch_my_posts():
-    # Only fetch if we haven't loaded anything yet or need more
-    skip = st.session_state.my_post_skip
-    new_posts = get(f"/posts/me?limit=1000&skip={skip}&sort=newest")
-    st.session_state.my_posts_loaded.extend(new_posts)
+def my_posts_endpoint(skip, last=None):
+    page = cursor_after(last, "newest") or f"skip={skip}"
+    summary = f"&summary={SUMMARY_LENGTH}" if SUMMARY_LENGTH else ""
+    return f"/posts/me?limit={MY_POSTS_PAGE_SIZE}&{page}&sort=newest{summary}"
+
+
+def add_my_posts(new_posts):
+    # Offsets can shift under us between pages; never list a post twice
+    loaded = {r.id for r in st.session_state.my_posts_loaded}
+    records = [r for r in ingest(new_posts) if r.id not in loaded]
+    st.session_state.my_posts_loaded.extend(records)
     st.session_state.my_post_skip += len(new_posts)
+    tally(records)
+    if new_posts:
+        st.session_state.my_posts_last = new_posts[-1]
+    if len(new_posts) < MY_POSTS_PAGE_SIZE:
+        st.session_state.my_posts_exhausted = True
+    else:
+        # Read ahead while the user is looking at this page
+        prefetch.start(PREFETCH_SLOT, next_my_posts_endpoint())
+
+
+def next_my_posts_endpoint():
+    return my_posts_endpoint(
+        st.session_state.my_post_skip, st.session_state.get("my_posts_last")
+    )
 
 
-# TRIGGER FETCH FIRST
-if not st.session_state.my_posts_loaded:
-    fetch_my_posts()
+# Paging state is plain data (offset, last item), so a request that fails or
+# raises leaves it as it was and the next "Load More" simply tries again
+def fetch_my_posts():
+    endpoint = next_my_posts_endpoint()
+    page = prefetch.take(PREFETCH_SLOT, endpoint)
+    if page is None:
+        page = get(endpoint)
+    if page is not None:
+        add_my_posts(page)
+
+
+# TRIGGER FETCH FIRST (profile and first page go out together)
+with metrics.phase("my_posts", "fetch"):
+    if st.session_state.my_posts_loaded or st.session_state.my_posts_exhausted:
+        current_user = get_current_user(needs=("id",))
+    else:
+        current_user, (first_page,) = get_current_user_with(
+            my_posts_endpoint(0), needs=("id",)
+        )
+        if first_page is not None:
+            # Later pages follow one bounded request per "Load More"
+            add_my_posts(first_page)
 
 # 5. -------------------- HEADER (CALCULATE STATS AFTER FETCH) --------------------
 st.title("📂 My Creations")
 
-# Now that fetch_my_posts() has run, these lists won't be empty
-my_posts = st.session_state.my_posts_loaded
-draft_count = len([i for i in my_posts if not i["Post"]["published"]])
-pub_count = len(my_posts) - draft_count
+# Counts cover the loaded pages only; "+" until the list has been read to the end
+more = "" if st.session_state.my_posts_exhausted else "+"
+draft_count = f"{st.session_state.my_post_counts['drafts']}{more}"
+pub_count = f"{st.session_state.my_post_counts['published']}{more}"
 
 c1, c2, c3 = st.columns(3)
 c1.markdown(
@@ -123,65 +175,75 @@ st.divider()
 
 # ... (Rest of the display loop) ...
 
+
 # 7. -------------------- DISPLAY LOOP --------------------
+@st.fragment
+def render_my_post_card(idx, p):
+
+    with st.container(border=True):
+        st.markdown(
+            card_header(
+                p,
+                f"Created {time_labels.get(p.id, '')}",
+                votes=f"{p.votes} 👍",
+                draft=not p.published,
+            ),
+            unsafe_allow_html=True,
+        )
+        st.markdown(card_body(p, excerpt=200))
+
+        # Action Buttons
+        b1, b2, b3 = st.columns([1, 1, 1])
+
+        if not p.published:
+            if b1.button(
+                "🚀 Publish",
+                key=f"pub_{p.id}",
+                use_container_width=True,
+                type="primary",
+            ):
+                tally([p], -1)
+                ok = update_post(
+                    st.session_state.my_posts_loaded, p.id, {"published": True}
+                )
+                tally([p])
+                if ok:
+                    st.toast("Post is now live! 🚀")
+                    # Publishing changes the draft/published stats above
+                    st.rerun()
+        else:
+            b1.button(
+                "✅ Published",
+                key=f"is_pub_{p.id}",
+                use_container_width=True,
+                disabled=True,
+            )
+
+        if b2.button("✏️ Edit", key=f"ed_{p.id}", use_container_width=True):
+            update_post_dialog(p)
+
+        if b3.button("🗑️", key=f"del_{p.id}", use_container_width=True):
+            confirm_delete(p)
+
+
 if not st.session_state.my_posts_loaded:
     st.info(
         "You haven't created any posts yet. Start by clicking 'Create' in the sidebar!"
     )
 else:
-    for idx, item in enumerate(st.session_state.my_posts_loaded):
-        p = item["Post"]
-
-        with st.container(border=True):
-            col_t, col_v = st.columns([4, 1])
-            col_t.markdown(
-                f"<div class='post-meta'>Created {time_ago(p['created_at'])}</div>",
-                unsafe_allow_html=True,
-            )
-            col_v.markdown(
-                f"<div style='text-align:right;'>{item['votes']} 👍</div>",
-                unsafe_allow_html=True,
-            )
-
-            if not p["published"]:
-                st.markdown(
-                    "<span class='draft-badge'>📝 Draft</span>", unsafe_allow_html=True
-                )
-
-            st.markdown(
-                f"<div class='post-title'>{p['title']}</div>", unsafe_allow_html=True
-            )
-            st.write(p["content"][:200] + ("..." if len(p["content"]) > 200 else ""))
-
-            # Action Buttons
-            b1, b2, b3 = st.columns([1, 1, 1])
-
-            if not p["published"]:
-                if b1.button(
-                    "🚀 Publish",
-                    key=f"pub_{p['id']}",
-                    use_container_width=True,
-                    type="primary",
-                ):
-                    patch(f"/posts/{p['id']}", {"published": True})
-                    st.toast("Post is now live! 🚀")
-                    reset_my_feed()
-                    st.rerun()
-            else:
-                b1.button(
-                    "✅ Published",
-                    key=f"is_pub_{p['id']}",
-                    use_container_width=True,
-                    disabled=True,
-                )
-
-            if b2.button("✏️ Edit", key=f"ed_{p['id']}", use_container_width=True):
-                update_post_dialog(p)
+    # Relative times for the visible window only, from one "now" per rerun
+    start, end, _, _ = window_bounds(len(st.session_state.my_posts_loaded), "my_feed")
+    with metrics.phase("my_posts", "time_labels"):
+        time_labels = time_ago_batch(st.session_state.my_posts_loaded[start:end])
 
-            if b3.button("🗑️", key=f"del_{p['id']}", use_container_width=True):
-                confirm_delete(p["id"])
+    with metrics.phase("my_posts", "render"):
+        at_end = render_window(
+            st.session_state.my_posts_loaded, render_my_post_card, key="my_feed"
+        )
 
-    if len(st.session_state.my_posts_loaded) >= 15:
+    if at_end and not st.session_state.my_posts_exhausted:
         if st.button("Load More", use_container_width=True):
+            loaded = len(st.session_state.my_posts_loaded)
             fetch_my_posts()
+            show_item("my_feed", loaded)
             st.rerun()
@@ -1,8 +1,10 @@
 import streamlit as st
 import time
 from core.auth import require_auth, logout
-from core.api import get, patch, delete
+from core.api import patch, delete
+from core.users import get_current_user
 from ui.sidebar import render_sidebar
+from ui.styles import inject
 from core.validators import valid_email, check_password_strength
 from core.post_utils import handle_create_post
 
@@ -11,72 +13,42 @@ require_auth()
 st.set_page_config(page_title="My Profile", layout="centered")
 
 # 2. -------------------- DYNAMIC MODERN CSS --------------------
-st.markdown(
-    """
-    <style>
-    /* Card adapts to light/dark background */
-    .profile-card {
-        border-radius: 16px;
-        border: 1px solid rgba(128, 128, 128, 0.2);
-        padding: 24px;
-        margin-bottom: 20px;
-        background-color: rgba(128, 128, 128, 0.03);
-    }
-    
-    .profile-info {
-        font-size: 1.1rem;
-        color: var(--text-color);
-        margin-bottom: 10px;
-        display: flex;
-        align-items: center;
-    }
-
-    .badge {
-        background: rgba(255, 75, 75, 0.1);
-        padding: 4px 10px;
-        border-radius: 8px;
-        margin-right: 12px;
-    }
-
-    /* Danger Zone Styling */
-    .danger-box {
-        border: 1px solid #ff4b4b;
-        border-radius: 12px;
-        padding: 20px;
-        background-color: rgba(255, 75, 75, 0.05);
-    }
-    </style>
-""",
-    unsafe_allow_html=True,
-)
+inject("profile")
+
 
 # 3. -------------------- SIDEBAR --------------------
+# Fragment: creating a post from here only reruns the form, not the profile
+# (clear_on_submit resets the inputs, so no extra rerun is needed)
+@st.fragment
+def quick_post_form():
+    st.markdown("### Create a New Post 📝")
+    with st.form("sidebar_create_form", clear_on_submit=True):
+        sidebar_title = st.text_input("Title").strip()
+        sidebar_content = st.text_area("Content").strip()
+        sidebar_published = st.checkbox("Publish now?", value=True)
+        submitted_sidebar = st.form_submit_button("Create", type="primary")
+
+    if submitted_sidebar:
+        error = handle_create_post(sidebar_title, sidebar_content, sidebar_published)
+        if error:
+            st.error(error)
+        else:
+            st.toast("✅ Post created successfully 🎉", icon="📝")
+            st.session_state.posts_loaded = []
+            st.session_state.post_skip = 0
+            st.session_state.feed_exhausted = False
+            st.session_state.pop("feed_index", None)
+
+
 with st.sidebar:
     with st.expander("➕ Quick Post", expanded=False):
-        st.markdown("### Create a New Post 📝")
-        with st.form("sidebar_create_form", clear_on_submit=True):
-            sidebar_title = st.text_input("Title").strip()
-            sidebar_content = st.text_area("Content").strip()
-            sidebar_published = st.checkbox("Publish now?", value=True)
-            submitted_sidebar = st.form_submit_button("Create", type="primary")
-
-        if submitted_sidebar:
-            error = handle_create_post(
-                sidebar_title, sidebar_content, sidebar_published
-            )
-            if error:
-                st.error(error)
-            else:
-                st.toast("✅ Post created successfully 🎉", icon="📝")
-                st.session_state.posts_loaded = []
-                st.session_state.post_skip = 0
-                st.rerun()
+        quick_post_form()
     st.sidebar.divider()
     render_sidebar()
 
 # 4. -------------------- PROFILE DATA --------------------
 st.title("👤 My Profile")
-user = get("/users/profile/me")
+user = get_current_user()
 
 tab1, tab2, tab3, tab4, tab5 = st.tabs(
     ["Profile", "Edit Profile", "Update Email", "Change Password", "Delete Account"]
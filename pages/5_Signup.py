@@ -1,6 +1,6 @@
 import streamlit as st
-import requests
-from core.config import API_BASE_URL, USERS_ENDPOINT
+from core.client import request
+from core.config import USERS_ENDPOINT
 from core.validators import valid_email, check_password_strength
 from core.auth import is_authenticated
 
@@ -34,8 +34,9 @@ else:
             if strength_errors:
                 st.error("Password must contain:\n- " + "\n- ".join(strength_errors))
             else:
-                response = requests.post(
-                    f"{API_BASE_URL}{USERS_ENDPOINT}",
+                response = request(
+                    "POST",
+                    USERS_ENDPOINT,
                     json={
                         "first_name": first,
                         "last_name": last,
@@ -0,0 +1,45 @@
+# ui/cards.py
+
+import html
+from functools import lru_cache
+
+from core.config import CARD_CACHE_SIZE
+
+
+# The read-only head of a post card (meta line, vote count, draft badge,
+# title) as one HTML string, so it is one element instead of four rebuilt on
+# every rerun. Keyed by everything the text depends on, so an edit, a vote,
+# a new time label or a different viewer (draft badge) simply misses. Every
+# user-supplied part is escaped here.
+@lru_cache(maxsize=CARD_CACHE_SIZE)
+def _header(meta, votes, draft, title):
+    head = f"<div class='post-meta'>{html.escape(meta)}</div>"
+    if votes:
+        head += f"<div class='post-votes'>{votes}</div>"
+    parts = [f"<div class='post-head'>{head}</div>"]
+    if draft:
+        parts.append("<div><span class='draft-badge'>📝 Draft</span></div>")
+    parts.append(f"<div class='post-title'>{html.escape(title)}</div>")
+    return "".join(parts)
+
+
+def card_header(post, meta, votes="", draft=False):
+    # For st.markdown(..., unsafe_allow_html=True); votes: the count as
+    # shown (HTML), "" for none
+    return _header(meta, votes, draft, post.title)
+
+
+def card_body(post, excerpt=None, body=None):
+    # Markdown for a plain st.markdown, never with unsafe_allow_html: the
+    # body is whatever the author wrote. excerpt: characters to show before
+    # "..."; body: the full text, when post.content is only a summary
+    # (core.bodies)
+    if body is None:
+        body = post.content
+        if excerpt is not None and (post.truncated or len(body) > excerpt):
+            body = body[:excerpt] + "..."
+    return body
+
+
+def cache_info():
+    return _header.cache_info()
@@ -0,0 +1,59 @@
+import streamlit as st
+from core.config import FEED_WINDOW_SIZE
+
+
+def _page_key(key):
+    return f"{key}_window_page"
+
+
+def reset_window(key):
+    st.session_state.pop(_page_key(key), None)
+
+
+def show_item(key, idx, page_size=FEED_WINDOW_SIZE):
+    # Jumps the window to the page holding item idx (e.g. a fresh batch)
+    st.session_state[_page_key(key)] = max(idx, 0) // page_size
+
+
+# Renders only the visible page of a (possibly long) list; everything else
+# stays as plain data in session state, so a rerun costs one page of cards
+# no matter how many posts have been loaded.
+def window_bounds(total, key, page_size=FEED_WINDOW_SIZE):
+    # (start, end, page, pages) of the slice the window is going to show
+    pages = max((total + page_size - 1) // page_size, 1)
+    page = min(st.session_state.get(_page_key(key), 0), pages - 1)
+    start = page * page_size
+    return start, min(start + page_size, total), page, pages
+
+
+def render_window(items, render_item, key, page_size=FEED_WINDOW_SIZE):
+    start, end, page, pages = window_bounds(len(items), key, page_size)
+    st.session_state[_page_key(key)] = page
+
+    st.markdown(f"<div id='{key}-top'></div>", unsafe_allow_html=True)
+    for idx in range(start, end):
+        render_item(idx, items[idx])
+
+    if pages > 1:
+        prev_col, info_col, next_col = st.columns([1, 2, 1])
+        if prev_col.button(
+            "◀ Prev", key=f"{key}_prev", disabled=page == 0, use_container_width=True
+        ):
+            st.session_state[_page_key(key)] = page - 1
+            st.rerun()
+        info_col.markdown(
+            f"<div style='text-align:center;'>Page <b>{page + 1}</b> of {pages}"
+            f" · <a href='#{key}-top'>↑ Top</a></div>",
+            unsafe_allow_html=True,
+        )
+        if next_col.button(
+            "Next ▶",
+            key=f"{key}_next",
+            disabled=page == pages - 1,
+            use_container_width=True,
+        ):
+            st.session_state[_page_key(key)] = page + 1
+            st.rerun()
+
+    # Callers only offer "Load More" once the user has reached the end
+    return page == pages - 1
@@ -0,0 +1,52 @@
+import streamlit as st
+from core import metrics
+from core.api import cache_stats
+from core.bodies import bodies
+from core.config import METRICS_ENABLED
+from ui.cards import cache_info
+
+
+def _rows(registry):
+    return [
+        {
+            "metric": series["name"],
+            "labels": ", ".join(f"{k}={v}" for k, v in series["labels"].items()),
+            "count": series["count"],
+            "avg ms": round(1000 * series["sum"] / series["count"], 2),
+            "p95 ≤ ms": 1000 * series["p95"],
+        }
+        for series in registry.snapshot()
+        if series["count"]
+    ]
+
+
+# Opt-in debug panel: needs METRICS_ENABLED=1 on the server and ?debug=1 in
+# the URL, so regular users never see (or pay for) it
+def render_metrics_panel():
+    if not METRICS_ENABLED or st.query_params.get("debug") != "1":
+        return
+    with st.sidebar.expander("📈 Metrics", expanded=False):
+        session = metrics.session_registry()
+        st.caption("This session")
+        st.dataframe(_rows(session), hide_index=True)
+        st.caption("Whole process")
+        st.dataframe(_rows(metrics.process_registry), hide_index=True)
+        st.caption("Caches")
+        caches = {
+            **cache_stats(),
+            "cards": cache_info()._asdict(),
+            "bodies": dict(bodies.stats),
+        }
+        st.json(caches, expanded=False)
+        st.download_button(
+            "Prometheus text",
+            metrics.to_prometheus(),
+            file_name="metrics.prom",
+            mime="text/plain",
+        )
+        st.download_button(
+            "JSONL",
+            metrics.to_jsonl(),
+            file_name="metrics.jsonl",
+            mime="application/jsonl",
+        )
@@ -1,5 +1,6 @@
 import streamlit as st
 from core.auth import logout
+from core.config import METRICS_ENABLED
 
 
 # Helper function for modern sidebar cards
@@ -7,41 +8,8 @@ def sidebar_card(label, icon="", page=None, key=None):
     full_label = f"{icon}  {label}" if icon else label
     key = key or full_label
 
-    # Render a Streamlit button
-    clicked = st.sidebar.button(full_label, key=key)
-
-    # CSS styling for a card-like button
-    st.markdown(
-        f"""
-    <style>
-    div.stButton > button[title="{full_label}"] {{
-        display: flex;
-        align-items: center;
-        gap: 10px;
-        justify-content: flex-start;
-        width: 100%;
-        padding: 14px 18px;
-        margin: 8px 0;
-        font-size: 16px;
-        font-weight: 500;
-        color: white;
-        background: linear-gradient(90deg, #6a11cb, #2575fc);
-        border: none;
-        border-radius: 12px;
-        cursor: pointer;
-        box-shadow: 0 4px 8px rgba(0,0,0,0.15);
-        transition: all 0.3s ease;
-        text-align: left;
-    }}
-    div.stButton > button[title="{full_label}"]:hover {{
-        background: linear-gradient(90deg, #2575fc, #6a11cb);
-        transform: translateY(-2px);
-        box-shadow: 0 6px 14px rgba(0,0,0,0.25);
-    }}
-    </style>
-    """,
-        unsafe_allow_html=True,
-    )
+    # Render a Streamlit button (styled by the "sidebar" sheet in ui.styles)
+    clicked = st.button(full_label, key=key)
 
     # Handle click
     if clicked:
@@ -53,9 +21,15 @@ def sidebar_card(label, icon="", page=None, key=None):
 
 # Sidebar rendering function
 def render_sidebar():
-    sidebar_card("Feed", "📜", page="pages/1_All_Posts.py", key="feed")
-    sidebar_card("Personal Feed", "📜", page="pages/2_My_Posts.py", key="myfeed")
-    sidebar_card(
-        "Update Profile", "👤", page="pages/4_User_Profile.py", key="update_profile"
-    )
-    sidebar_card("🚪 Sign out", "🔓", page="logout", key="sign_out")
+    with st.sidebar.container(key="sidebar_nav"):
+        sidebar_card("Feed", "📜", page="pages/1_All_Posts.py", key="feed")
+        sidebar_card("Personal Feed", "📜", page="pages/2_My_Posts.py", key="myfeed")
+        sidebar_card(
+            "Update Profile", "👤", page="pages/4_User_Profile.py", key="update_profile"
+        )
+        sidebar_card("🚪 Sign out", "🔓", page="logout", key="sign_out")
+    if METRICS_ENABLED:
+        # Only loaded (with its dataframe/export code) when metrics are on
+        from ui.metrics_panel import render_metrics_panel
+
+        render_metrics_panel()
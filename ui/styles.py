@@ -0,0 +1,120 @@
+import re
+from functools import lru_cache
+
+import streamlit as st
+
+# Every rule the app uses, by name. Pages pick the sheets they need and
+# inject() sends them as one <style> element. Streamlit drops any element a
+# full rerun does not emit again, so the sheet still goes out once per full
+# rerun (fragment reruns skip it), but it is built once per process and
+# replaces the old per-button and per-page blocks.
+SHEETS = {
+    # Sidebar navigation: one class-based rule for every button in the
+    # st.container(key="sidebar_nav") that render_sidebar() draws
+    "sidebar": """
+    .st-key-sidebar_nav .stButton > button {
+        display: flex;
+        align-items: center;
+        gap: 10px;
+        justify-content: flex-start;
+        width: 100%;
+        padding: 14px 18px;
+        margin: 8px 0;
+        font-size: 16px;
+        font-weight: 500;
+        color: white;
+        background: linear-gradient(90deg, #6a11cb, #2575fc);
+        border: none;
+        border-radius: 12px;
+        cursor: pointer;
+        box-shadow: 0 4px 8px rgba(0,0,0,0.15);
+        transition: all 0.3s ease;
+        text-align: left;
+    }
+    .st-key-sidebar_nav .stButton > button:hover {
+        background: linear-gradient(90deg, #2575fc, #6a11cb);
+        transform: translateY(-2px);
+        box-shadow: 0 6px 14px rgba(0,0,0,0.25);
+    }
+    """,
+    # Post cards, shared by the feed and My Posts
+    "posts": """
+    div[data-testid="stVBCard"] {
+        border-radius: 16px;
+        border: 1px solid rgba(128, 128, 128, 0.2);
+        padding: 24px;
+        margin-bottom: 20px;
+        background-color: rgba(128, 128, 128, 0.03);
+    }
+    .post-head { display: flex; justify-content: space-between; gap: 12px; }
+    .post-meta { color: var(--text-color); opacity: 0.6; font-size: 0.85rem; margin-bottom: 8px; }
+    .post-votes { text-align: right; white-space: nowrap; }
+    .post-title { font-size: 1.5rem; font-weight: 800; color: var(--text-color); margin-bottom: 12px; letter-spacing: -0.02em; line-height: 1.2; }
+    .draft-badge {
+        display: inline-block; padding: 2px 10px; border-radius: 20px;
+        background-color: rgba(255, 165, 0, 0.2); color: #ffa500;
+        font-size: 0.75rem; font-weight: 700; text-transform: uppercase; margin-bottom: 10px;
+    }
+    """,
+    "feed": """
+    div[data-testid="stVBCard"] { transition: transform 0.2s ease; }
+    div[data-testid="stVBCard"]:hover {
+        border-color: #ff4b4b;
+        box-shadow: 0 4px 12px rgba(0,0,0,0.1);
+    }
+    """,
+    "my_posts": """
+    .stats-badge {
+        background: rgba(128, 128, 128, 0.1);
+        padding: 5px 12px;
+        border-radius: 10px;
+        font-size: 0.9rem;
+    }
+    """,
+    "profile": """
+    /* Card adapts to light/dark background */
+    .profile-card {
+        border-radius: 16px;
+        border: 1px solid rgba(128, 128, 128, 0.2);
+        padding: 24px;
+        margin-bottom: 20px;
+        background-color: rgba(128, 128, 128, 0.03);
+    }
+    .profile-info {
+        font-size: 1.1rem;
+        color: var(--text-color);
+        margin-bottom: 10px;
+        display: flex;
+        align-items: center;
+    }
+    .badge {
+        background: rgba(255, 75, 75, 0.1);
+        padding: 4px 10px;
+        border-radius: 8px;
+        margin-right: 12px;
+    }
+    /* Danger Zone Styling */
+    .danger-box {
+        border: 1px solid #ff4b4b;
+        border-radius: 12px;
+        padding: 20px;
+        background-color: rgba(255, 75, 75, 0.05);
+    }
+    """,
+}
+
+
+def _minify(css):
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r":\s+", ":", css)
+    return re.sub(r"\s*([{};,])\s*", r"\1", css).replace(";}", "}").strip()
+
+
+@lru_cache(maxsize=None)
+def stylesheet(*names):
+    return "<style>" + "".join(_minify(SHEETS[name]) for name in names) + "</style>"
+
+
+def inject(*names):
+    st.markdown(stylesheet("sidebar", *names), unsafe_allow_html=True)